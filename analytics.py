@@ -0,0 +1,136 @@
+"""Voraggregierte Auswertungen: Wochen-Rollups je (tag, exercise, week) und PR-Verlauf je Übung."""
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROLLUP_COLS = ["tag","exercise","week","tonnage","sets","reps","best_e1rm"]  # week = Montag (ISO)
+PR_COLS = ["exercise","date","tag","weight","reps","rpe","e1rm"]
+
+def e1rm(weight, reps, rpe=None):
+    """Geschätztes 1RM (Epley); Wdh. in Reserve (10 − RPE) zählen als mögliche Wdh. mit. NaN ohne Gewicht/Wdh."""
+    w, r = np.asarray(weight, dtype=float), np.asarray(reps, dtype=float)
+    rir = 0.0 if rpe is None else np.clip(10.0 - np.nan_to_num(np.asarray(rpe, dtype=float), nan=10.0), 0.0, None)
+    return np.where((w > 0) & (r >= 1), w * (1 + (r + rir) / 30), np.nan)
+
+def week_of(d) -> str:
+    x = date.fromisoformat(str(d)[:10])
+    return (x - timedelta(days=x.weekday())).isoformat()
+
+def _sets(df: pd.DataFrame) -> pd.DataFrame:
+    """Roh-Sätze -> numerisch + week, tonnage, e1rm."""
+    num = {c: pd.to_numeric(df[c], errors="coerce") for c in ["weight","reps","rpe"]}
+    dt = pd.to_datetime(df["date"], errors="coerce")
+    week = (dt - pd.to_timedelta(dt.dt.weekday, unit="D")).dt.strftime("%Y-%m-%d")
+    return pd.DataFrame({"tag": df["tag"], "exercise": df["exercise"], "date": df["date"], "week": week, **num,
+                         "tonnage": (num["weight"] * num["reps"]).fillna(0.0),
+                         "e1rm": e1rm(num["weight"], num["reps"], num["rpe"])}).dropna(subset=["week"])
+
+def weekly_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """Tonnage (kg × Wdh.), Sätze, Wdh. und bestes e1RM je (tag, exercise, week)."""
+    if df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLS)
+    d = _sets(df)
+    g = d.groupby(["tag","exercise","week"], sort=True)
+    out = g[["tonnage","reps"]].sum().join(g.size().rename("sets")).join(g["e1rm"].max().rename("best_e1rm"))
+    return out.reset_index()[ROLLUP_COLS]
+
+def pr_history(df: pd.DataFrame) -> pd.DataFrame:
+    """Sätze, die das bisher beste e1RM ihrer Übung übertroffen haben (chronologisch, tag-übergreifend)."""
+    if df.empty:
+        return pd.DataFrame(columns=PR_COLS)
+    d = _sets(df).dropna(subset=["e1rm"]).sort_values("date", kind="stable")
+    prev = d.groupby("exercise")["e1rm"].cummax().groupby(d["exercise"]).shift()
+    return d.loc[prev.isna() | (d["e1rm"] > prev), PR_COLS].reset_index(drop=True)
+
+class Rollups:
+    """Materialisierte Rollups eines Stores, beim ersten Zugriff aus dem Log gebaut.
+
+    append führt Woche und PR-Liste inkrementell nach; nach delete werden nur die betroffene Woche bzw.
+    die PRs der Übung beim nächsten Zugriff aus dem Store neu berechnet (Undo bleibt billig).
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._lock = store._lock if store is not None else threading.RLock()
+        self._weeks = None  # (tag, exercise, week) -> [tonnage, sets, reps, best_e1rm]
+        self._prs = None    # exercise -> [(date, tag, weight, reps, rpe, e1rm), ...] (chronologisch)
+        self._dirty = set()      # Wochen-Zellen nach delete
+        self._dirty_prs = set()  # Übungen nach delete / Nachtrag älterer Sätze
+
+    def rebuild(self, df: pd.DataFrame = None):
+        with self._lock:
+            df = self.store.load_range(columns=["date","tag","exercise","weight","reps","rpe"]) if df is None else df
+            self._weeks = {(t, ex, wk): [ton, s, r, b]
+                           for t, ex, wk, ton, s, r, b in weekly_rollup(df).itertuples(index=False)}
+            self._prs = {}
+            for ex, *rest in pr_history(df).itertuples(index=False):
+                self._prs.setdefault(ex, []).append(tuple(rest))
+            self._dirty.clear(); self._dirty_prs.clear()
+
+    def _rows(self, **filters) -> pd.DataFrame:
+        parts = list(self.store.iter_rows(**filters))
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["date","tag","exercise","weight","reps","rpe"])
+
+    def _ensure(self):
+        with self._lock:
+            if self.store is not None:
+                self.store.refresh()
+            if self._weeks is None:
+                self.rebuild()
+            for t, ex, wk in list(self._dirty):
+                end = (date.fromisoformat(wk) + timedelta(days=6)).isoformat()
+                w = weekly_rollup(self._rows(start=wk, end=end, tags=[t], exercises=[ex]))
+                self._weeks.pop((t, ex, wk), None)
+                for *_, ton, s, r, b in w.itertuples(index=False):
+                    self._weeks[(t, ex, wk)] = [ton, s, r, b]
+            for ex in list(self._dirty_prs):
+                self._prs[ex] = [tuple(rest) for _, *rest in pr_history(self._rows(exercises=[ex])).itertuples(index=False)]
+            self._dirty.clear(); self._dirty_prs.clear()
+
+    def weeks(self) -> pd.DataFrame:
+        self._ensure()
+        with self._lock:
+            rows = [(*k, *v) for k, v in self._weeks.items()]
+        return pd.DataFrame(rows, columns=ROLLUP_COLS).sort_values(["week","tag","exercise"], ignore_index=True)
+
+    def prs(self) -> pd.DataFrame:
+        self._ensure()
+        with self._lock:
+            rows = [(ex, *p) for ex, ps in self._prs.items() for p in ps]
+        return pd.DataFrame(rows, columns=PR_COLS).sort_values(["date","exercise"], kind="stable", ignore_index=True)
+
+    def on_append(self, row: dict):
+        with self._lock:
+            if self._weeks is None: return
+            t, ex, d = row["tag"], row["exercise"], row["date"]
+            w, r, e = (pd.to_numeric(row.get(c), errors="coerce") for c in ("weight","reps","rpe"))
+            key = (t, ex, week_of(d))
+            if key not in self._dirty:
+                cell = self._weeks.setdefault(key, [0.0, 0, 0, np.nan])
+                cell[0] += 0.0 if pd.isna(w * r) else float(w * r)
+                cell[1] += 1
+                cell[2] += 0 if pd.isna(r) else r
+                cell[3] = np.fmax(cell[3], float(e1rm(w, r, e)))
+            prs = self._prs.setdefault(ex, [])
+            if ex in self._dirty_prs:
+                return
+            if prs and d < prs[-1][0]:  # Nachtrag vor dem letzten PR -> Reihenfolge neu bestimmen
+                self._dirty_prs.add(ex)
+                return
+            est = float(e1rm(w, r, e))
+            if not np.isnan(est) and (not prs or est > prs[-1][5]):
+                prs.append((d, t, w, r, e, est))
+
+    def on_delete(self, date: str, tag: str, exercise: str, set_no: int):
+        with self._lock:
+            if self._weeks is None: return
+            self._dirty.add((tag, exercise, week_of(date)))
+            if any(p[0] == date for p in self._prs.get(exercise, [])):
+                self._dirty_prs.add(exercise)
+
+    def reset(self):
+        with self._lock:
+            self._weeks = self._prs = None
+            self._dirty.clear(); self._dirty_prs.clear()
@@ -0,0 +1,140 @@
+"""Headless-Replay der Coach-Regeln: geht Logs Einheit für Einheit durch und vergleicht, was der Coach
+aus der jeweiligen Vor-Einheit vorgeschlagen hätte, mit dem, was tatsächlich trainiert wurde.
+
+    python backtest.py athletes/*/workout_log.sqlite                 # je Log ein Task im Prozess-Pool
+    python backtest.py --synthetic 500 --rpe-add 8.5,9.0 --rpe-hold 9.5,10 --out replay.csv
+"""
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import coach
+from bench import synthetic_log
+from coach import BY, DEFAULT_META, PLAN, RPE_ADD, RPE_HOLD
+from storage import read_log
+
+WEIGHT_TOL = 0.5  # kg; Abweichung darunter gilt als "gleiches Gewicht" (wie slip_table)
+REPLAY_COLS = BY + ["date","case","mode","base","step","suggested","weight","reps_min","reps_sum","rpe",
+                    "actual","followed","in_range","error"]
+
+def _meta(pairs: pd.DataFrame) -> pd.DataFrame:
+    """lr, hr, inc, tp je (tag, exercise): Plan-Eintrag des Tags, sonst DEFAULT_META (wie suggest_target)."""
+    meta = {(t, n): tuple(m) for t in PLAN for n, *m in PLAN[t]}
+    rows = [(t, ex) + meta.get((t, ex), DEFAULT_META) for t, ex in pairs[BY].drop_duplicates().itertuples(index=False)]
+    return pd.DataFrame(rows, columns=BY + ["lr","hr","inc","tp"])
+
+def replay(df: pd.DataFrame, **rules) -> pd.DataFrame:
+    """Je Einheit ab der zweiten einer Übung: Vorschlag aus der Vor-Einheit vs. Ist.
+
+    `actual`: add_weight / add_rep / hold / drop gegenüber der Vor-Einheit; `followed`: Gewicht wie
+    vorgeschlagen (±WEIGHT_TOL); `in_range`: alle Sätze ≥ lr; `error` = Ist- minus Vorschlagsgewicht.
+    `rules` gehen an `coach.suggest_batch` (rpe_add, rpe_hold).
+    """
+    if df.empty:
+        return pd.DataFrame(columns=REPLAY_COLS)
+    reps = pd.to_numeric(df["reps"], errors="coerce")
+    ses = coach.session_table(df).merge(
+        reps.groupby([df[c] for c in BY + ["date"]]).min().rename("reps_min").reset_index(), on=BY + ["date"])
+    ses["target"] = ses.groupby(BY)["date"].shift(-1)  # nächste Einheit derselben Übung
+    prev = ses.loc[ses["target"].notna(), BY + ["date","target","reps_sum"]]
+    hist = df.merge(prev[BY + ["date","target"]], on=BY + ["date"])
+    slots = prev[BY + ["target"]].merge(_meta(prev), on=BY)
+    out = (coach.suggest_batch(hist, slots, by=BY + ["target"], **rules).drop(columns=["msg"])
+           .merge(prev[BY + ["target","reps_sum"]].rename(columns={"reps_sum": "reps_sum_prev"}), on=BY + ["target"])
+           .rename(columns={"target": "date"})
+           .merge(ses[BY + ["date","weight","reps_min","reps_sum","rpe"]], on=BY + ["date"]))
+    out["suggested"] = out["base"] + out["step"]
+    dw = out["weight"] - out["base"]
+    out["actual"] = np.select([dw > WEIGHT_TOL, dw < -WEIGHT_TOL, out["reps_sum"] > out["reps_sum_prev"]],
+                              ["add_weight", "drop", "add_rep"], default="hold")
+    out["error"] = out["weight"] - out["suggested"]
+    out["followed"] = out["error"].abs() <= WEIGHT_TOL
+    out["in_range"] = out["reps_min"] >= out["lr"]
+    return out[REPLAY_COLS]
+
+def deload_replay(df: pd.DataFrame, slip_tol: int = 2, weight_tol: float = WEIGHT_TOL) -> pd.DataFrame:
+    """Fatigue-Teil von `needs_deload` an jedem Trainingstag: rutschende Plan-Übungen nach Stand des Tages."""
+    plan = pd.DataFrame([(t, n) for t in PLAN for n, *_ in PLAN[t]], columns=BY)
+    ses = coach.session_table(df).merge(plan, on=BY).sort_values(BY + ["date"])
+    g = ses.groupby(BY)
+    ses["slip"] = (((ses["weight"] - g["weight"].shift()).abs() <= weight_tol)
+                   & (ses["reps_sum"] < g["reps_sum"].shift())).astype(float)
+    days = sorted(df["date"].dropna().unique())
+    slips = (ses.pivot_table(index="date", columns=BY, values="slip", aggfunc="last")
+                .reindex(days).ffill().fillna(0).sum(axis=1).astype(int))
+    return pd.DataFrame({"date": days, "slips": slips.to_numpy(), "fatigue": slips.to_numpy() >= slip_tol})
+
+def _load(src) -> pd.DataFrame:
+    """Pfad (Backend nach Endung wie open_store, nur lesend) oder ("synthetic", seed, tage)."""
+    if isinstance(src, tuple):
+        _, seed, days = src
+        return synthetic_log(days, 1, seed)
+    return read_log(src)
+
+def _label(src) -> str:
+    return f"synthetic:{src[1]}" if isinstance(src, tuple) else src
+
+def _job(task):
+    """Ein Log, alle Regel-Kombinationen (Log wird nur einmal geladen)."""
+    src, grid, slip_tol = task
+    df = _load(src)
+    reps = [replay(df, **rules).assign(log=_label(src), rules=_rules_label(rules)) for rules in grid]
+    dl = deload_replay(df, slip_tol).assign(log=_label(src))
+    return pd.concat(reps, ignore_index=True), dl
+
+def _rules_label(rules: dict) -> str:
+    return ",".join(f"{k}={v:g}" for k, v in sorted(rules.items()))
+
+def run(sources, grid=({"rpe_add": RPE_ADD, "rpe_hold": RPE_HOLD},), slip_tol: int = 2, workers: int = None):
+    """Replay aller `sources` parallel (Prozess-Pool; workers=1 -> im eigenen Prozess). Gibt (replay, deload)."""
+    tasks = [(src, list(grid), slip_tol) for src in sources]
+    if workers == 1:
+        parts = [_job(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as ex:
+            parts = list(ex.map(_job, tasks, chunksize=max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))))
+    if not parts:
+        return pd.DataFrame(columns=REPLAY_COLS + ["log","rules"]), pd.DataFrame(columns=["date","slips","fatigue","log"])
+    return (pd.concat([r for r, _ in parts], ignore_index=True),
+            pd.concat([d for _, d in parts], ignore_index=True))
+
+def summarize(rep: pd.DataFrame) -> pd.DataFrame:
+    """Je Regel-Satz und Coach-Fall: Anzahl, Anteil befolgt, Anteil im Zielbereich, mittlere Gewichtsabweichung."""
+    return (rep.groupby(["rules","case"])
+               .agg(n=("date","size"), followed=("followed","mean"), in_range=("in_range","mean"),
+                    error_kg=("error","mean"))
+               .round(3).reset_index())
+
+def _floats(s: str) -> list:
+    return [float(x) for x in s.split(",") if x]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("logs", nargs="*", help="Log-Dateien (.csv/.sqlite/.parquet)")
+    ap.add_argument("--synthetic", type=int, default=0, metavar="N", help="zusätzlich N synthetische Athleten")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--rpe-add", default=f"{RPE_ADD:g}")
+    ap.add_argument("--rpe-hold", default=f"{RPE_HOLD:g}")
+    ap.add_argument("--slip-tol", type=int, default=2)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", help="Replay je Einheit als CSV")
+    args = ap.parse_args(argv)
+    sources = list(args.logs) + [("synthetic", seed, args.days) for seed in range(args.synthetic)]
+    if not sources:
+        ap.error("keine Logs angegeben (Dateien oder --synthetic N)")
+    grid = [{"rpe_add": a, "rpe_hold": h} for a, h in itertools.product(_floats(args.rpe_add), _floats(args.rpe_hold))]
+    rep, dl = run(sources, grid, args.slip_tol, args.workers)
+    if args.out:
+        rep.to_csv(args.out, index=False)
+    print(summarize(rep).to_string(index=False))
+    print(f"\n{rep['log'].nunique()} Logs · {len(rep) // max(1, len(grid))} Einheiten je Regel-Satz · "
+          f"Deload (Ermüdung) an {int(dl['fatigue'].sum())} von {len(dl)} Trainingstagen")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
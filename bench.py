@@ -0,0 +1,180 @@
+"""Headless-Benchmark mit synthetischen Trainings-Logs; schreibt die Laufzeiten als JSON.
+
+    python bench.py                                    # alle Szenarien und Backends -> bench_results.json
+    python bench.py --scenarios month,year --backends sqlite --repeat 3 --out neu.json
+    python bench.py --compare alt.json neu.json        # Mediane vergleichen, Exit-Code 1 bei Regression
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+import coach
+from coach import EXERCISE_POOL, PLAN, sets_target
+from storage import LOG_COLS, CsvStore, ParquetStore, SqliteStore, export_csv, import_csv
+from sync import StorePeer, sync
+
+SCENARIOS = {  # Name -> (Tage, Athleten); "team" = alle Athleten in einem gemeinsamen Log
+    "month":  (30, 1),
+    "year":   (365, 1),
+    "decade": (3650, 1),
+    "team":   (365, 100),
+}
+BACKENDS = {"csv": ("workout_log.csv", CsvStore), "sqlite": ("workout_log.sqlite", SqliteStore),
+            "parquet": ("workout_log.parquet", ParquetStore)}
+RPES = [7.0, 7.5, 8.0, 8.5, 9.0, 9.5, 10.0]
+
+def synthetic_log(days: int, athletes: int = 1, seed: int = 0, end: date = None) -> pd.DataFrame:
+    """A/B im Wechsel alle 1–3 Tage, ~10 % getauschte Übungen, Double-Progression mit zufälligen Reps/RPE."""
+    rng = random.Random(seed)
+    end = end or date.today() - timedelta(days=1)
+    rows = []
+    for _ in range(athletes):
+        weights = {}
+        d, tag = end - timedelta(days=days - 1), "A"
+        while d <= end:
+            for name, lr, hr, inc, tp in PLAN[tag]:
+                ex = rng.choice(EXERCISE_POOL) if rng.random() < 0.1 else name
+                w = weights.setdefault((tag, ex), rng.choice([10.0, 20.0, 40.0]))
+                reps = [rng.randint(lr - 2, hr) for _ in range(sets_target(tp))]
+                rows += [(d.isoformat(), tag, ex, s, w, r, rng.choice(RPES), "") for s, r in enumerate(reps, start=1)]
+                if min(reps) >= hr:
+                    weights[(tag, ex)] = w + inc
+            d, tag = d + timedelta(days=rng.choice([1, 2, 2, 3])), "B" if tag == "A" else "A"
+    return pd.DataFrame(rows, columns=LOG_COLS)
+
+def page_work(store, tag: str = "A"):
+    """Datenarbeit eines Reruns von fitness.py (ohne Rendering)."""
+    idx = store.index
+    today = date.today().isoformat()
+    idx.ensure([(t, n) for t in PLAN for n in EXERCISE_POOL])
+    coach.needs_deload(idx.frame((t, n) for t in PLAN for (n, *_ ) in PLAN[t]), date.today())
+    sum(len(u.sets) for u in (idx.last(tag, n) for n in EXERCISE_POOL) if u is not None and u.date == today)
+    coach.suggest_day_index(idx, tag)
+    for n, *_ in PLAN[tag]:
+        coach.build_last_summary(idx, tag, n)
+    store.tail(30)
+
+def _stats(ms: list) -> dict:
+    return {"n": len(ms), "min_ms": round(min(ms), 3), "median_ms": round(statistics.median(ms), 3),
+            "max_ms": round(max(ms), 3)}
+
+def _time(fn, repeat: int, after=None) -> dict:
+    ms = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        ms.append((time.perf_counter() - t0) * 1000)
+        if after: after()
+    return _stats(ms)
+
+def run_backend(df: pd.DataFrame, backend: str, workdir: str, repeat: int) -> dict:
+    """Alle Messfälle für einen Log in einem Backend; Ergebnis: {case: stats}."""
+    name, cls = BACKENDS[backend]
+    path = os.path.join(workdir, name)
+    export = os.path.join(workdir, "export.csv")
+    df.to_csv(export, index=False)
+    store = cls(path)
+    store.save(df)
+    tag, plan = "A", [(n, (lr, hr, inc, tp)) for n, lr, hr, inc, tp in PLAN["A"]]
+    row = {"date": date.today().isoformat(), "tag": tag, "exercise": plan[0][0], "set": 1,
+           "weight": 20.0, "reps": 10, "rpe": 8.0, "note": ""}
+    undo = lambda: store.delete(row["date"], tag, row["exercise"], 1)
+
+    res = {}
+    res["load_log.cold"] = _time(lambda: cls(path).load(), repeat)
+    store.load()
+    res["load_log.warm"] = _time(store.load, repeat)
+    res["append_row"] = _time(lambda: store.append(row), repeat, after=undo)
+    res["undo_last_set"] = _time(undo, repeat, after=lambda: store.append(row))
+    undo()
+    res["index.cold"] = _time(lambda: (store.index.reset(), store.index.ensure([(t, n) for t in PLAN for n in EXERCISE_POOL])), repeat)
+    res["last_unit"] = _time(lambda: [coach.last_unit(store.index, tag, n) for n, _ in plan], repeat)
+    res["build_last_summary"] = _time(lambda: [coach.build_last_summary(store.index, tag, n) for n, _ in plan], repeat)
+    res["suggest_target"] = _time(lambda: [coach.suggest_target(store.index.rows([(tag, n)]), tag, n, m) for n, m in plan], repeat)
+    res["suggest_unit"] = _time(lambda: [coach.suggest_unit(store.index.last(tag, n), tag, n, m) for n, m in plan], repeat)
+    res["suggest_target.full_log"] = _time(lambda: [coach.suggest_target(df, tag, n, m) for n, m in plan], repeat)
+    res["suggest_day"] = _time(lambda: coach.suggest_day(store.index.rows((tag, n) for n, _ in plan), tag), repeat)
+    res["suggest_day.index"] = _time(lambda: coach.suggest_day_index(store.index, tag), repeat)
+    pairs = [(t, n) for t in PLAN for (n, *_ ) in PLAN[t]]
+    res["needs_deload"] = _time(lambda: coach.needs_deload(store.index.frame(pairs), date.today()), repeat)
+    res["needs_deload.full_log"] = _time(lambda: coach.needs_deload(coach.session_table(df), date.today()), repeat)
+    res["rollups.rebuild"] = _time(lambda: store.rollups.rebuild(df), repeat)
+    res["rollups.append_undo"] = _time(lambda: (store.append(row), store.rollups.weeks(), undo(), store.rollups.weeks()), repeat)
+    res["import_csv"] = _time(lambda: import_csv(store, export), repeat)
+    res["export_csv"] = _time(lambda: b"".join(export_csv(store)), repeat)
+    res["export_csv.month"] = _time(lambda: b"".join(export_csv(store, date.today() - timedelta(days=30))), repeat)
+    peer = StorePeer(cls(os.path.join(workdir, "peer." + name)))
+    sync(store, peer)  # Erstabgleich (ganzer Log) nicht gemessen
+    res["sync.delta"] = _time(lambda: (store.append(row), sync(store, peer), undo(), sync(store, peer)), repeat)
+    res["page.cold"] = _time(lambda: page_work(cls(path), tag), repeat)
+    page_work(store, tag)
+    res["page.warm"] = _time(lambda: page_work(store, tag), repeat)
+    return res
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def run(scenarios, backends, repeat: int = 5, seed: int = 0) -> dict:
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "git": _git_rev(),
+              "python": platform.python_version(), "pandas": pd.__version__, "repeat": repeat, "results": []}
+    for sc in scenarios:
+        days, athletes = SCENARIOS[sc]
+        df = synthetic_log(days, athletes, seed)
+        for be in backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                for case, stats in run_backend(df, be, tmp, repeat).items():
+                    report["results"].append({"scenario": sc, "days": days, "athletes": athletes, "rows": len(df),
+                                              "backend": be, "case": case, **stats})
+                    print(f"{sc:7} {be:6} {case:24} {stats['median_ms']:10.2f} ms", file=sys.stderr)
+    return report
+
+def compare(old: dict, new: dict, threshold: float = 1.2, min_ms: float = 1.0) -> int:
+    """Vergleicht Mediane zweier Reports; Regression = > threshold × alt und mindestens `min_ms` langsamer."""
+    key = lambda r: (r["scenario"], r["backend"], r["case"])
+    base = {key(r): r for r in old["results"]}
+    regressions = 0
+    for r in new["results"]:
+        o = base.get(key(r))
+        if o is None: continue
+        ratio = r["median_ms"] / o["median_ms"] if o["median_ms"] else float("inf")
+        flag = ratio > threshold and r["median_ms"] - o["median_ms"] >= min_ms
+        regressions += flag
+        print(f"{r['scenario']:7} {r['backend']:6} {r['case']:24} {o['median_ms']:10.2f} -> {r['median_ms']:10.2f} ms"
+              f"  x{ratio:5.2f}" + ("  REGRESSION" if flag else ""))
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS))
+    ap.add_argument("--backends", default=",".join(BACKENDS))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", nargs=2, metavar=("ALT", "NEU"))
+    ap.add_argument("--threshold", type=float, default=1.2)
+    ap.add_argument("--min-ms", type=float, default=1.0)
+    args = ap.parse_args(argv)
+    if args.compare:
+        with open(args.compare[0]) as a, open(args.compare[1]) as b:
+            return 1 if compare(json.load(a), json.load(b), args.threshold, args.min_ms) else 0
+    report = run(args.scenarios.split(","), args.backends.split(","), args.repeat, args.seed)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=1)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
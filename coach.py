@@ -0,0 +1,256 @@
+"""Trainingsplan, Coach-Regeln und vektorisierte Auswertungen über den Trainings-Log (ohne Streamlit nutzbar)."""
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from storage import SessionIndex
+
+# ------------------------- PLAN & EXERCISE POOL -------------------------
+PLAN = {
+    "A": [
+        ("Schrägbankdrücken KH/LH", 6, 10, 2.5, "main"),
+        ("Plate-Loaded Press",       8, 10, 2.5, "main"),
+        ("Schulterpresse",           8, 10, 2.5, "main"),
+        ("Kabel-Seitheben einarmig",12, 15, 1.0, "iso"),
+        ("Fliegende (Kabel/Maschine)",12,15, 1.0, "iso"),
+        ("Trizepsdrücken Seil",     12, 15, 1.0, "iso"),
+        ("Overhead-Trizeps Seil",   12, 15, 1.0, "iso"),
+        ("Bauchmaschine",           15, 15, 1.0, "core")
+    ],
+    "B": [
+        ("Latzug eng Neutralgriff",  8, 12, 2.5, "main"),
+        ("Rudern eng Kabel",         8, 12, 2.5, "main"),
+        ("Rudern Maschine (Brustauflage)",10,12,2.5,"main"),
+        ("Beinpresse",              10, 12, 5.0, "main"),
+        ("Beinstrecker",            12, 15, 2.0, "iso"),
+        ("Beinbeuger liegend",      12, 15, 2.0, "iso"),
+        ("Kabel-Curls Seil",        10, 12, 1.0, "iso"),
+        ("Hammer Curls KH",         12, 15, 1.0, "iso"),
+        ("Face Pulls Kabel",        12, 15, 0.5, "prehab")
+    ]
+}
+EXERCISE_POOL = sorted(list({
+    n for day in PLAN.values() for (n, *_ ) in day
+}.union({
+    "Brustpresse Maschine","Dips","Butterfly Maschine",
+    "Latzug breit","Klimmzug (assistiert)","T-Bar Rudern",
+    "Ausfallschritte","Beinbeuger sitzend","Seitheben KH","Overhead-Press LH"
+})))
+
+SETS_MAIN = 3
+SETS_ISO  = 2
+DEFAULT_META = (8, 12, 2.5, "main")  # (lr, hr, inc, tp) für Übungen ohne Plan-Eintrag
+RPE_ADD  = 9.0  # +Gewicht nur, wenn RPE max der letzten Einheit höchstens so hoch war
+RPE_HOLD = 9.5  # ab hier Gewicht halten, solange nicht alle Sätze oben im Ziel waren
+
+BY = ["tag","exercise"]  # Schlüssel einer Übung; für mehrere Athleten z. B. ["athlete","tag","exercise"]
+SESSION_COLS = ["date","weight","reps_sum","rpe","sets"]
+
+def sets_target(tp: str) -> int:
+    return SETS_MAIN if tp == "main" else SETS_ISO
+
+# ------------------------- LETZTE EINHEIT (Index) -------------------------
+def last_unit(idx: SessionIndex, tag: str, ex_name: str):
+    u = idx.last(tag, ex_name)
+    if u is None: return None, None
+    return u.date, u
+
+def build_last_summary(idx: SessionIndex, tag: str, ex_name: str):
+    """Erzeugt kompakte Zusammenfassung (Text) + Details-DataFrame der letzten Einheit."""
+    d, u = last_unit(idx, tag, ex_name)
+    if u is None or not u.sets:
+        return None, None, None
+    # kompakter Reps-String, z.B. "10/9/8"
+    reps_str = "/".join(str(r) for r in u.reps) if u.reps else "–"
+    # kleines DataFrame für Details (Sätze liegen im Index bereits sortiert)
+    details = pd.DataFrame(list(u.sets), columns=["Satz","Gewicht","Wdh.","RPE"])
+    return d, f"{u.weight:.1f} kg · Reps: {reps_str}" + (f" · RPE max {u.rpe:.1f}" if u.rpe is not None else ""), details
+
+# ------------------------- COACH (Batch) -------------------------
+def day_slots(tag: str, chosen: dict = None) -> pd.DataFrame:
+    """Übungen eines Trainingstags als Slot-Tabelle (tag, slot, exercise, lr, hr, inc, tp).
+
+    `chosen` = {slot: Übung} für getauschte Übungen; ohne Plan-Eintrag gilt die Range des Original-Slots.
+    Für mehrere Athleten: `athletes.merge(day_slots(tag), how="cross")` und `by=["athlete", *BY]`.
+    """
+    return pd.DataFrame(_day_rows(tag, chosen), columns=["tag","slot","exercise","lr","hr","inc","tp"])
+
+def _day_rows(tag: str, chosen: dict = None) -> list:
+    meta = {n: (lr, hr, inc, tp) for n, lr, hr, inc, tp in PLAN[tag]}
+    rows = []
+    for i, (n, lr, hr, inc, tp) in enumerate(PLAN[tag], start=1):
+        ex = (chosen or {}).get(i, n)
+        rows.append((tag, i, ex) + meta.get(ex, (lr, hr, inc, tp)))
+    return rows
+
+def _message(case: str, r) -> str:
+    if case == "start":
+        return f"Erste Einheit: Startgewicht wählen. Ziel: {sets_target(r.tp)} Sätze {r.lr}–{r.hr}."
+    if case == "weight":
+        return f"Heute **+{r.inc} kg** → Range reset ({r.lr}–{r.lr+1}). Letztes Mal ~{r.base:.1f} kg (RPE max {r.max_rpe:.1f})."
+    if case in ("hold_rpe", "hold_rpe_low"):
+        hint = ("Gewicht halten (optional −1–2 kg), erst stabil in den Zielbereich kommen." if case == "hold_rpe_low"
+                else "Gewicht halten, Reps Richtung oberes Ziel bringen.")
+        return f"{hint} Letztes Mal: ~{r.base:.1f} kg, Ø{r.avg_reps:.1f} Wdh., RPE max {r.max_rpe:.1f}."
+    if case == "hold_low":
+        return f"Gewicht halten (optional −1–2 kg). Ziel: erst {r.lr}–{r.hr} stabil erreichen. Letztes Mal ~{r.base:.1f} kg."
+    if case == "near_top":
+        return f"Heute **+1 Wdh./Satz** bei ~{r.base:.1f} kg, bis {r.hr} erreicht. RPE ok ({r.max_rpe:.1f})."
+    return f"Heute **+1 Wdh./Satz** bei ~{r.base:.1f} kg. Wenn RPE ≤ 9 bleibt, bald +{r.inc} kg."
+
+def _rules(seen, n, top, below, inrange, avg_reps, max_rpe, hr, inc, rpe_add, rpe_hold):
+    """Die Coach-Regeln – eine Quelle für `suggest_batch` (Spalten) und `evaluate` (numpy-Skalare).
+
+    `seen`: es gibt eine letzte Einheit; `n`: Sätze mit Wdh.; `top`/`below`/`inrange`: davon ≥ hr / < lr / ≥ lr.
+    Gibt (case, mode, step) zurück.
+    """
+    all_top       = (n >= 1) & (top == n)
+    many_below_lr = (n >= 1) & (below >= np.maximum(1, n // 2))
+    near_top      = (n >= 1) & (inrange == n) & (avg_reps >= hr - 1)
+    hold_rpe      = (max_rpe >= rpe_hold) & ~all_top
+    case = np.select(
+        [~seen, all_top & (max_rpe <= rpe_add), hold_rpe & many_below_lr, hold_rpe, many_below_lr, near_top & (max_rpe <= rpe_add)],
+        ["start", "weight", "hold_rpe_low", "hold_rpe", "hold_low", "near_top"], default="rep")
+    mode = np.select([case == "start", case == "weight"], ["start", "add_weight"], default="add_rep")
+    step = np.where(case == "weight", inc, np.where(case == "start", np.nan, 0.0))
+    return case, mode, step
+
+def suggest_batch(history: pd.DataFrame, slots: pd.DataFrame, by=BY,
+                  rpe_add: float = RPE_ADD, rpe_hold: float = RPE_HOLD) -> pd.DataFrame:
+    """Coach-Empfehlung für alle Slots in einem Durchgang (viele Athleten/Einheiten, z. B. backtest.py).
+
+    `history`: Roh-Sätze (ganzer Log oder nur die letzten Einheiten, z. B. `SessionIndex.rows`).
+    `slots`: je Zeile `by` + lr, hr, inc, tp (siehe `day_slots`). Ergebnis: `slots` + mode, case, base, step, msg;
+    `step` ist das Gewichts-Plus (0.0 bei Wdh.-Progression, NaN bei Erst-Einheit), `case` die greifende Regel.
+    `rpe_add`/`rpe_hold`: RPE-Schwellen für +Gewicht bzw. Gewicht halten (zum Tunen, siehe backtest.py).
+    """
+    by = list(by)
+    slots = slots.reset_index(drop=True)
+    h = history[by + ["date","reps","weight","rpe"]]
+    h = h.assign(**{c: pd.to_numeric(h[c], errors="coerce") for c in ["weight","reps","rpe"]})
+    h = h.merge(slots[by].drop_duplicates(), on=by)
+    day = pd.Series(pd.factorize(h["date"], sort=True)[0], index=h.index)  # Datum als Rang; max über Strings ist langsam
+    u = h[(day >= 0) & (day == day.groupby([h[c] for c in by]).transform("max"))]  # Sätze der letzten Einheit
+    u = u.merge(slots[by + ["lr","hr"]].rename_axis("_slot").reset_index(), on=by)
+    has = u["reps"].notna()
+    flags = pd.DataFrame({"_slot": u["_slot"], "reps_sum": u["reps"], "n": has, "top": has & (u["reps"] >= u["hr"]),
+                          "below": has & (u["reps"] < u["lr"]), "inrange": has & (u["reps"] >= u["lr"])})
+    g = flags.groupby("_slot")
+    a = g.sum().join(u.groupby("_slot")[["weight","rpe"]].max()).join(g.size().rename("rows"))
+    a = a.rename(columns={"weight": "base", "rpe": "max_rpe"}).reindex(slots.index)
+    n = a["n"].fillna(0)
+    max_rpe  = a["max_rpe"].fillna(8.0)
+    avg_reps = (a["reps_sum"] / n).where(n > 0, 0.0)
+    case, mode, step = _rules(a["rows"].notna(), n, a["top"], a["below"], a["inrange"], avg_reps, max_rpe,
+                              slots["hr"], slots["inc"], rpe_add, rpe_hold)
+    out = slots.assign(mode=mode, case=case, base=a["base"], step=step, max_rpe=max_rpe, avg_reps=avg_reps)
+    out["msg"] = [_message(c, r) for c, r in zip(case, out.itertuples(index=False))]
+    return out.drop(columns=["max_rpe","avg_reps"])
+
+def _as_suggestion(r) -> dict:
+    """Zeile aus `suggest_batch` -> Dict im Format der Coach-Box."""
+    lr, hr = int(r.lr), int(r.hr)
+    if r.mode == "start":
+        return {"msg": r.msg, "mode": "start", "lr": lr, "hr": hr, "tp": r.tp}
+    return {"msg": r.msg, "mode": r.mode, "inc": float(r.step), "base": float(r.base), "lr": lr, "hr": hr, "tp": r.tp}
+
+# ------------------------- COACH (eine Übung) -------------------------
+def _num(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+def evaluate(sets, lr: int, hr: int, inc: float, tp: str,
+             rpe_add: float = RPE_ADD, rpe_hold: float = RPE_HOLD) -> dict:
+    """Coach-Regeln (`_rules`) für eine Übung ohne DataFrames, z. B. aus dem SessionIndex.
+
+    `sets`: [(weight, reps, rpe), ...] der letzten Einheit (leer = Erst-Einheit).
+    """
+    col = lambda i: [x for x in (_num(s[i]) for s in sets) if x == x]
+    ws, reps, rpes = col(0), col(1), col(2)
+    n = np.int64(len(reps))
+    max_rpe = max(rpes) if rpes else 8.0
+    avg_reps = sum(reps) / n if n else 0.0
+    case, mode, step = _rules(np.bool_(bool(sets)), n, sum(r >= hr for r in reps), sum(r < lr for r in reps),
+                              sum(r >= lr for r in reps), avg_reps, max_rpe, hr, inc, rpe_add, rpe_hold)
+    r = SimpleNamespace(lr=lr, hr=hr, inc=inc, tp=tp, base=max(ws) if ws else np.nan, max_rpe=max_rpe,
+                        avg_reps=avg_reps, mode=str(mode), step=float(step))
+    r.msg = _message(str(case), r)
+    return _as_suggestion(r)
+
+def _last_sets(df: pd.DataFrame, tag: str, ex_name: str) -> list:
+    """(weight, reps, rpe) der letzten Einheit von (tag, ex_name) in Roh-Sätzen."""
+    m = (df["tag"] == tag) & (df["exercise"] == ex_name)
+    if not m.any():
+        return []
+    d = df["date"][m]
+    rows = df.loc[d.index[d == d.max()]]
+    return list(zip(rows["weight"], rows["reps"], rows["rpe"]))
+
+def _meta(tag: str, ex_name: str, fallback_meta=None) -> tuple:
+    # Range/Inc/Typ ermitteln (bei Tausch fallbacks nutzen)
+    return next((tuple(m) for n, *m in PLAN[tag] if n == ex_name), fallback_meta or DEFAULT_META)
+
+def suggest_day(history: pd.DataFrame, tag: str, chosen: dict = None) -> dict:
+    """Empfehlungen für alle Übungen eines Tags in einem `suggest_batch`-Durchgang: {slot: suggestion}."""
+    out = suggest_batch(history, day_slots(tag, chosen))
+    return {int(r.slot): _as_suggestion(r) for r in out.itertuples(index=False)}
+
+def suggest_target(df: pd.DataFrame, tag: str, ex_name: str, fallback_meta=None):
+    """Empfehlung für eine Übung aus Roh-Sätzen (ganzer Log oder `SessionIndex.rows`)."""
+    return evaluate(_last_sets(df, tag, ex_name), *_meta(tag, ex_name, fallback_meta))
+
+def _unit_sets(u) -> list:
+    return [(w, r, e) for _, w, r, e in u.sets] if u is not None else []
+
+def suggest_unit(u, tag: str, ex_name: str, fallback_meta=None):
+    """Empfehlung direkt aus der letzten Einheit des Index (`SessionIndex.last`, None = noch nie trainiert)."""
+    return evaluate(_unit_sets(u), *_meta(tag, ex_name, fallback_meta))
+
+def suggest_day_index(idx, tag: str, chosen: dict = None) -> dict:
+    """Wie `suggest_day`, aber aus der letzten Einheit je Slot im SessionIndex (ohne Roh-Sätze)."""
+    return {i: evaluate(_unit_sets(idx.last(t, ex)), lr, hr, inc, tp)
+            for t, i, ex, lr, hr, inc, tp in _day_rows(tag, chosen)}
+
+# ------------------------- DELOAD -------------------------
+def weeks_since(d: date) -> int:
+    return max(1, (date.today() - d).days // 7 + 1)
+
+def session_table(df: pd.DataFrame, by=BY) -> pd.DataFrame:
+    """Aggregiert Roh-Sätze je Einheit (by + date): max Gewicht, Reps-Summe, max RPE, Satzanzahl."""
+    by = list(by)
+    if df.empty:
+        return pd.DataFrame(columns=by + SESSION_COLS)
+    num = df.assign(**{c: pd.to_numeric(df[c], errors="coerce") for c in ["weight","reps","rpe"]})
+    return (num.groupby(by + ["date"], sort=True)
+               .agg(weight=("weight","max"), reps_sum=("reps","sum"), rpe=("rpe","max"), sets=("set","count"))
+               .reset_index())
+
+def slip_table(sessions: pd.DataFrame, by=BY, weight_tol: float = 0.5) -> pd.DataFrame:
+    """Vergleicht je Übung die letzten zwei Einheiten aus `session_table`.
+
+    Eine Übung "rutscht", wenn das Gewicht gleich blieb (±`weight_tol`), die Reps-Summe aber sank.
+    Übungen mit nur einer Einheit fehlen in der Tabelle.
+    """
+    by = list(by)
+    cols = by + ["date_prev","date","weight_prev","weight","reps_sum_prev","reps_sum","slip"]
+    if sessions.empty:
+        return pd.DataFrame(columns=cols)
+    last2 = sessions.sort_values(by + ["date"]).groupby(by).tail(2)
+    pos = last2.groupby(by).cumcount(ascending=False)  # 0 = letzte, 1 = vorletzte Einheit
+    cur  = last2[pos == 0].set_index(by)[["date","weight","reps_sum"]]
+    prev = last2[pos == 1].set_index(by)[["date","weight","reps_sum"]]
+    t = cur.join(prev, rsuffix="_prev", how="inner")
+    t["slip"] = ((t["weight"] - t["weight_prev"]).abs() <= weight_tol) & (t["reps_sum"] < t["reps_sum_prev"])
+    return t.reset_index()[cols]
+
+def needs_deload(sessions: pd.DataFrame, block_start: date, every_weeks: int = 8, slip_tol: int = 2):
+    """`sessions`: Einheiten-Aggregate (`session_table(log)` oder `SessionIndex.frame(...)`)."""
+    time_flag = (weeks_since(block_start) % every_weeks == 0)
+    plan_pairs = pd.DataFrame([(t, name) for t in ["A","B"] for (name, *_ ) in PLAN[t]], columns=["tag","exercise"])
+    slips = int(slip_table(sessions.merge(plan_pairs, on=["tag","exercise"]))["slip"].sum())
+    fatigue_flag = (slips >= slip_tol)
+    return (time_flag or fatigue_flag), {"time": time_flag, "fatigue": fatigue_flag, "slips": slips}
@@ -1,21 +1,37 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, date, timedelta
+from datetime import date
 import os
 
+from coach import (PLAN, EXERCISE_POOL, SETS_MAIN, SETS_ISO, sets_target, build_last_summary,
+                   suggest_day_index, suggest_unit, needs_deload)
+from perf import Recorder
+from sync import open_peer, sync
+from storage import (LOG_COLS, athlete_slug, export_csv_file, import_csv, io_counts, list_athletes, open_store,
+                     partition_path)
+
 st.set_page_config(page_title="Progressions-Coach A/B", layout="centered")
 
 # ------------------------- SESSION STATE (früh, damit Timer sofort kann) -------------------------
-if "timer_start" not in st.session_state: st.session_state["timer_start"] = None
-if "timer_end" not in st.session_state:   st.session_state["timer_end"]   = None
+if "timer_cmd" not in st.session_state:   st.session_state["timer_cmd"]   = None  # letztes Startkommando
+if "timer_seq" not in st.session_state:   st.session_state["timer_seq"]   = 0  # Zähler der Start-Kommandos
+if "timer_sid" not in st.session_state:   st.session_state["timer_sid"]   = os.urandom(4).hex()  # neue Session -> neue Kommando-IDs
 if "auto_timer_seconds" not in st.session_state: st.session_state["auto_timer_seconds"] = 90
 if "saved_flags" not in st.session_state: st.session_state["saved_flags"] = {}
 if "chosen_map" not in st.session_state:  st.session_state["chosen_map"]  = {}  # key: (tag, idx, date) -> chosen_name
 if "autopilot" not in st.session_state:   st.session_state["autopilot"]   = False
 if "focus_anchor" not in st.session_state:st.session_state["focus_anchor"]= ""
+if "athlete" not in st.session_state:     st.session_state["athlete"]     = ""  # "" = gemeinsamer Log
+if "active_athlete" not in st.session_state: st.session_state["active_athlete"] = ""
 if "current_date" not in st.session_state:
     st.session_state["current_date"] = date.today().isoformat()
 
+# Laufzeit je Rerun (Phasen + Datei-/DB-Zugriffe), letzte PERF_KEEP Läufe
+PERF_KEEP = 50
+if "perf" not in st.session_state: st.session_state["perf"] = Recorder(PERF_KEEP, io_counts)
+PERF = st.session_state["perf"]
+PERF.begin("app")
+
 # Tageswechsel -> Haken & Auswahl leeren
 if st.session_state["current_date"] != date.today().isoformat():
     st.session_state["current_date"] = date.today().isoformat()
@@ -23,236 +39,134 @@ if st.session_state["current_date"] != date.today().isoformat():
     st.session_state["chosen_map"].clear()
     st.session_state["focus_anchor"] = ""
 
-# ------------------------- STICKY TIMER (immer rendern, ganz oben) -------------------------
+# ------------------------- STICKY TIMER (einmal mounten, nur Deltas senden) -------------------------
+# Das Panel lebt als Singleton im Browser (window.gxTimer) und rechnet mit der eigenen Uhr.
+# Python schickt nur Kommandos {id, op, secs}; jedes id wird genau einmal ausgeführt.
+# Kein Rückkanal: Panel-Buttons kosten keinen Rerun. Läuft ein von Hand gestarteter Timer,
+# lässt das Startkommando der Auto-Pause ihn stehen.
+TIMER_JS = """
+export default function(component) {
+  const { data } = component;
+  var W = window, D = document;
+  if (!W.gxTimer) {
+    W.gxTimer = {
+      tStart:0, tEnd:0, done:true, manual:false, badge:null, applied:null,
+      running:function(){return !!this.tEnd && !this.done;},
+      start:function(s,manual){var n=Date.now();this.tStart=n;this.tEnd=n+s*1000;this.done=false;this.manual=!!manual;},
+      stop:function(){this.tStart=0;this.tEnd=0;this.done=true;this.manual=false;if(this.badge) this.badge.textContent='⏱ 0s';},
+      shift:function(ms){if(!this.tEnd) return; this.tEnd=Math.max(Date.now(), this.tEnd+ms);},
+      blink:function(){
+        var old=D.getElementById('gx-flash-overlay'); if(old&&old.parentNode) old.parentNode.removeChild(old);
+        var ov=D.createElement('div'); ov.id='gx-flash-overlay';
+        ov.style.cssText='position:fixed;inset:0;background:#00c853;opacity:0;pointer-events:none;z-index:2147483647;transition:opacity 120ms ease';
+        D.body.appendChild(ov); void ov.offsetHeight;
+        var f=0,intv=setInterval(function(){ov.style.opacity=(f%2===0)?'0.65':'0';f++;if(f>=10){clearInterval(intv);if(ov&&ov.parentNode)ov.parentNode.removeChild(ov);}},500);
+      },
+      beep:function(){
+        try{var ctx=new (W.AudioContext||W.webkitAudioContext)(),o=ctx.createOscillator(),g=ctx.createGain();
+        o.type='sine';o.frequency.value=880;o.connect(g);g.connect(ctx.destination);
+        g.gain.setValueAtTime(0.0001,ctx.currentTime);g.gain.exponentialRampToValueAtTime(0.5,ctx.currentTime+0.02);
+        g.gain.exponentialRampToValueAtTime(0.0001,ctx.currentTime+0.35);o.start();o.stop(ctx.currentTime+0.37);}catch(e){}}
+    };
+    var T=W.gxTimer, p=D.createElement('div'); p.id='gx-timer-panel';
+    p.style.cssText='position:fixed;right:16px;top:16px;z-index:2147483647;display:flex;gap:8px;align-items:center';
+    var b=D.createElement('div'); b.id='gx-timer-badge'; b.textContent='⏱ 0s';
+    b.style.cssText='background:rgba(20,20,20,.92);color:#fff;padding:8px 12px;border-radius:12px;font-size:18px;font-weight:800;border:1px solid rgba(255,255,255,.08);box-shadow:0 8px 24px rgba(0,0,0,.35)';
+    T.badge=b;
+    function mk(id,lab,fn){var x=D.createElement('button');x.id=id;x.textContent=lab;x.style.cssText='font-size:12px;font-weight:800;line-height:1;padding:8px 10px;border-radius:10px;border:1px solid rgba(255,255,255,.15);background:rgba(32,32,32,.95);color:#fff;cursor:pointer';x.onmousedown=()=>x.style.transform='translateY(1px)';x.onmouseup=()=>x.style.transform='';
+      x.onclick=fn; return x;}
+    p.appendChild(b);
+    [['gx60','60s',()=>T.start(60,true)],['gx90','90s',()=>T.start(90,true)],['gx120','120s',()=>T.start(120,true)],
+     ['gxm5','−5s',()=>T.shift(-5000)],['gxp5','+5s',()=>T.shift(5000)],['gxstp','Stop',()=>T.stop()]]
+      .forEach(function(a){p.appendChild(mk(a[0],a[1],a[2]));});
+    D.body.appendChild(p);
+    function fmt(s){if(s<60)return s+'s';var m=Math.floor(s/60),x=s%60;return m+':' + (x<10?('0'+x):x);}
+    function tick(){var e=T.tEnd;if(!e){b.textContent='⏱ 0s';return;} var rem=Math.floor((e-Date.now())/1000);
+      if(rem<=0){b.textContent='⏱ 0s'; if(!T.done){T.done=true;T.blink();T.beep(); if(W.navigator&&W.navigator.vibrate)W.navigator.vibrate([200,100,200,100,200]);} return;}
+      b.textContent='⏱ '+fmt(rem);}
+    tick(); W.setInterval(tick,250);
+  }
+  var T = W.gxTimer, cmd = data || {};
+  if (cmd.id && cmd.id !== T.applied) {
+    T.applied = cmd.id;
+    if (cmd.op === 'start') { if (!(T.manual && T.running())) T.start(cmd.secs); }
+    else if (cmd.op === 'stop') T.stop();
+  }
+}
+"""
+timer_component = st.components.v2.component("gx_rest_timer", js=TIMER_JS)
+
+def start_timer(secs: int):
+    """Auto-Pause: Startkommando für den Browser-Timer (wird beim nächsten Timer-Rerun einmal ausgeführt)."""
+    st.session_state["timer_seq"] += 1
+    st.session_state["timer_cmd"] = {"id": f"{st.session_state['timer_sid']}:{st.session_state['timer_seq']}",
+                                     "op": "start", "secs": int(secs)}
+
+@st.fragment(key="timer")  # läuft nach ✅ mit dem Übungs-Fragment mit (Auto-Pause)
+@PERF.timed("timer")
 def render_sticky_timer():
-    start_ms = int(st.session_state["timer_start"].timestamp() * 1000) if st.session_state.get("timer_start") else 0
-    end_ms   = int(st.session_state["timer_end"].timestamp() * 1000)   if st.session_state.get("timer_end")   else 0
-    html = """
-    <script>
-    (function(){
-      var W = window.parent || window, D = W.document;
-      if (!W.gxTimer) {
-        W.gxTimer = {
-          tStart:0, tEnd:0, done:false, badge:null,
-          start:function(s){var n=Date.now();this.tStart=n;this.tEnd=n+s*1000;this.done=false;},
-          stop:function(){this.tStart=0;this.tEnd=0;this.done=true;if(this.badge) this.badge.textContent='⏱ 0s';},
-          shift:function(ms){if(!this.tEnd) return; this.tEnd=Math.max(Date.now(), this.tEnd+ms);},
-          blink:function(){
-            var old=D.getElementById('gx-flash-overlay'); if(old&&old.parentNode) old.parentNode.removeChild(old);
-            var ov=D.createElement('div'); ov.id='gx-flash-overlay';
-            ov.style.cssText='position:fixed;inset:0;background:#00c853;opacity:0;pointer-events:none;z-index:2147483647;transition:opacity 120ms ease';
-            D.body.appendChild(ov); void ov.offsetHeight;
-            var f=0,intv=setInterval(function(){ov.style.opacity=(f%2===0)?'0.65':'0';f++;if(f>=10){clearInterval(intv);if(ov&&ov.parentNode)ov.parentNode.removeChild(ov);}},500);
-          },
-          beep:function(){
-            try{var ctx=new (W.AudioContext||W.webkitAudioContext)(),o=ctx.createOscillator(),g=ctx.createGain();
-            o.type='sine';o.frequency.value=880;o.connect(g);g.connect(ctx.destination);
-            g.gain.setValueAtTime(0.0001,ctx.currentTime);g.gain.exponentialRampToValueAtTime(0.5,ctx.currentTime+0.02);
-            g.gain.exponentialRampToValueAtTime(0.0001,ctx.currentTime+0.35);o.start();o.stop(ctx.currentTime+0.37);}catch(e){}}
-        };
-        var p=D.createElement('div'); p.id='gx-timer-panel';
-        p.style.cssText='position:fixed;right:16px;top:16px;z-index:2147483647;display:flex;gap:8px;align-items:center';
-        var b=D.createElement('div'); b.id='gx-timer-badge'; b.textContent='⏱ 0s';
-        b.style.cssText='background:rgba(20,20,20,.92);color:#fff;padding:8px 12px;border-radius:12px;font-size:18px;font-weight:800;border:1px solid rgba(255,255,255,.08);box-shadow:0 8px 24px rgba(0,0,0,.35)';
-        W.gxTimer.badge=b;
-        function mk(id,lab){var x=D.createElement('button');x.id=id;x.textContent=lab;x.style.cssText='font-size:12px;font-weight:800;line-height:1;padding:8px 10px;border-radius:10px;border:1px solid rgba(255,255,255,.15);background:rgba(32,32,32,.95);color:#fff;cursor:pointer';x.onmousedown=()=>x.style.transform='translateY(1px)';x.onmouseup=()=>x.style.transform='';return x;}
-        var s60=mk('gx60','60s'),s90=mk('gx90','90s'),s120=mk('gx120','120s'),m5=mk('gxm5','−5s'),p5=mk('gxp5','+5s'),stp=mk('gxstp','Stop');
-        p.appendChild(b); p.appendChild(s60); p.appendChild(s90); p.appendChild(s120); p.appendChild(m5); p.appendChild(p5); p.appendChild(stp); D.body.appendChild(p);
-        s60.onclick=function(){W.gxTimer.start(60)}; s90.onclick=function(){W.gxTimer.start(90)}; s120.onclick=function(){W.gxTimer.start(120)};
-        m5.onclick=function(){W.gxTimer.shift(-5000)}; p5.onclick=function(){W.gxTimer.shift(5000)}; stp.onclick=function(){W.gxTimer.stop()};
-        function fmt(s){if(s<60)return s+'s';var m=Math.floor(s/60),x=s%60;return m+':' + (x<10?('0'+x):x);}
-        function tick(){var e=W.gxTimer.tEnd;if(!e){b.textContent='⏱ 0s';return;} var rem=Math.floor((e-Date.now())/1000);
-          if(rem<=0){b.textContent='⏱ 0s'; if(!W.gxTimer.done){W.gxTimer.done=true;W.gxTimer.blink();W.gxTimer.beep(); if(W.navigator&&W.navigator.vibrate)W.navigator.vibrate([200,100,200,100,200]);} return;}
-          b.textContent='⏱ '+fmt(rem);}
-        tick(); W.setInterval(tick,250);
-      }
-      // Backend-Zeiten in Singleton setzen
-      var newStart = """ + str(start_ms) + """;
-      var newEnd   = """ + str(end_ms) + """;
-      if (newEnd > 0) { W.gxTimer.tStart = newStart; W.gxTimer.tEnd = newEnd; W.gxTimer.done=false; }
-    })();
-    </script>
-    """
-    st.components.v1.html(html, height=1)
+    timer_component(data=st.session_state["timer_cmd"], key="rest_timer", height=0)
 
 render_sticky_timer()  # <-- immer sichtbar
 
-# ------------------------- PLAN & EXERCISE POOL -------------------------
-PLAN = {
-    "A": [
-        ("Schrägbankdrücken KH/LH", 6, 10, 2.5, "main"),
-        ("Plate-Loaded Press",       8, 10, 2.5, "main"),
-        ("Schulterpresse",           8, 10, 2.5, "main"),
-        ("Kabel-Seitheben einarmig",12, 15, 1.0, "iso"),
-        ("Fliegende (Kabel/Maschine)",12,15, 1.0, "iso"),
-        ("Trizepsdrücken Seil",     12, 15, 1.0, "iso"),
-        ("Overhead-Trizeps Seil",   12, 15, 1.0, "iso"),
-        ("Bauchmaschine",           15, 15, 1.0, "core")
-    ],
-    "B": [
-        ("Latzug eng Neutralgriff",  8, 12, 2.5, "main"),
-        ("Rudern eng Kabel",         8, 12, 2.5, "main"),
-        ("Rudern Maschine (Brustauflage)",10,12,2.5,"main"),
-        ("Beinpresse",              10, 12, 5.0, "main"),
-        ("Beinstrecker",            12, 15, 2.0, "iso"),
-        ("Beinbeuger liegend",      12, 15, 2.0, "iso"),
-        ("Kabel-Curls Seil",        10, 12, 1.0, "iso"),
-        ("Hammer Curls KH",         12, 15, 1.0, "iso"),
-        ("Face Pulls Kabel",        12, 15, 0.5, "prehab")
-    ]
-}
-EXERCISE_POOL = sorted(list({
-    n for day in PLAN.values() for (n, *_ ) in day
-}.union({
-    "Brustpresse Maschine","Dips","Butterfly Maschine",
-    "Latzug breit","Klimmzug (assistiert)","T-Bar Rudern",
-    "Ausfallschritte","Beinbeuger sitzend","Seitheben KH","Overhead-Press LH"
-})))
-
-SETS_MAIN = 3
-SETS_ISO  = 2
+# ------------------------- STORAGE -------------------------
 CSV_PATH  = "workout_log.csv"
+DB_PATH   = "workout_log.sqlite"
+ARCHIVE_PATH = "workout_log.parquet"
+BACKEND   = "sqlite"  # "sqlite" (indiziert), "parquet" (kompaktes Archiv) oder "csv" (append-only Journal)
+APPEND_ONLY = True    # CSV/Parquet: False -> jeder Satz schreibt die ganze Datei neu
+
+def open_athlete_store(athlete: str):
+    """Log-Partition des Athleten (athletes/<name>/…); ohne Athlet der bisherige gemeinsame Log."""
+    if BACKEND in ("sqlite", "parquet"):
+        path = DB_PATH if BACKEND == "sqlite" else ARCHIVE_PATH
+        return open_store(partition_path(path, athlete), csv_path=partition_path(CSV_PATH, athlete), append_only=APPEND_ONLY)
+    return open_store(partition_path(CSV_PATH, athlete), append_only=APPEND_ONLY)
+
+def add_athlete():
+    name = athlete_slug(st.session_state["new_athlete"])
+    if name:
+        open_athlete_store(name)  # legt die Partition an
+        st.session_state["athlete"] = name
+    st.session_state["new_athlete"] = ""
 
 # ------------------------- STORAGE HELPERS -------------------------
 def load_log() -> pd.DataFrame:
-    cols = ["date","tag","exercise","set","weight","reps","rpe","note"]
-    if os.path.exists(CSV_PATH):
-        try:
-            df = pd.read_csv(CSV_PATH)
-            for c in cols:
-                if c not in df.columns: df[c] = None
-            return df[cols]
-        except Exception:
-            return pd.DataFrame(columns=cols)
-    return pd.DataFrame(columns=cols)
+    return STORE.load()
 
 def save_log(df: pd.DataFrame):
-    df.to_csv(CSV_PATH, index=False)
+    STORE.save(df)
 
 def append_row(row: dict):
-    df = load_log()
-    df.loc[len(df)] = row
-    save_log(df)
-
-# ------------------------- TRAINING LOGIC -------------------------
-def sets_target(tp: str) -> int:
-    return SETS_MAIN if tp == "main" else SETS_ISO
-
-def last_unit(df: pd.DataFrame, tag: str, ex_name: str):
-    sub = df[(df["tag"] == tag) & (df["exercise"] == ex_name)]
-    if sub.empty: return None, None
-    dates = sorted(sub["date"].unique())
-    d = dates[-1]
-    return d, sub[sub["date"] == d]
-
-def build_last_summary(df: pd.DataFrame, tag: str, ex_name: str):
-    """Erzeugt kompakte Zusammenfassung (Text) + Details-DataFrame der letzten Einheit."""
-    d, u = last_unit(df, tag, ex_name)
-    if u is None or u.empty:
-        return None, None, None
-    # sort by set
-    u = u.sort_values("set")
-    last_w = float(u["weight"].max())
-    reps_list = [int(x) for x in u["reps"].tolist() if pd.notnull(x)]
-    rpe_list  = [float(x) for x in u["rpe"].tolist()  if pd.notnull(x)]
-    max_rpe   = max(rpe_list) if rpe_list else None
-    # kompakter Reps-String, z.B. "10/9/8"
-    reps_str = "/".join(str(r) for r in reps_list) if reps_list else "–"
-    # kleines DataFrame für Details
-    details = u[["set","weight","reps","rpe"]].rename(columns={"set":"Satz","weight":"Gewicht","reps":"Wdh.","rpe":"RPE"})
-    return d, f"{last_w:.1f} kg · Reps: {reps_str}" + (f" · RPE max {max_rpe:.1f}" if max_rpe is not None else ""), details
-
-def suggest_target(df: pd.DataFrame, tag: str, ex_name: str, fallback_meta=None):
-    # Range/Inc/Typ ermitteln (bei Tausch fallbacks nutzen)
-    lr = hr = inc = None
-    tp = "main"
-    found = False
-    for n, a, b, c, t in PLAN[tag]:
-        if n == ex_name:
-            lr, hr, inc, tp = a, b, c, t
-            found = True
-            break
-    if not found:
-        if fallback_meta is not None:
-            lr, hr, inc, tp = fallback_meta
-        else:
-            lr, hr, inc, tp = 8, 12, 2.5, "main"
-
-    hist_date, unit = last_unit(df, tag, ex_name)
-    if unit is None or unit.empty:
-        return {"msg": f"Erste Einheit: Startgewicht wählen. Ziel: {sets_target(tp)} Sätze {lr}–{hr}.",
-                "mode": "start", "lr": lr, "hr": hr, "tp": tp}
-
-    last_w = float(unit["weight"].max())
-    reps_list = [int(x) for x in unit["reps"].tolist() if pd.notnull(x)]
-    rpe_list  = [float(x) for x in unit["rpe"].tolist()  if pd.notnull(x)]
-    max_rpe   = max(rpe_list) if rpe_list else 8.0
-    avg_reps  = sum(reps_list)/len(reps_list) if reps_list else 0
-    sets_cnt  = len(reps_list) if reps_list else 0
-
-    all_top       = (sets_cnt >= 1) and all(r >= hr for r in reps_list)
-    many_below_lr = (sets_cnt >= 1) and (sum(r < lr for r in reps_list) >= max(1, sets_cnt // 2))
-    near_top      = (sets_cnt >= 1) and all(r >= lr for r in reps_list) and (avg_reps >= (hr - 1))
-
-    if all_top and max_rpe <= 9.0:
-        return {"msg": f"Heute **+{inc} kg** → Range reset ({lr}–{lr+1}). Letztes Mal ~{last_w:.1f} kg (RPE max {max_rpe:.1f}).",
-                "mode":"add_weight","inc":inc,"base":last_w,"lr":lr,"hr":hr,"tp":tp}
-
-    if max_rpe >= 9.5 and not all_top:
-        hint = "Gewicht halten, Reps Richtung oberes Ziel bringen."
-        if many_below_lr:
-            hint = "Gewicht halten (optional −1–2 kg), erst stabil in den Zielbereich kommen."
-        return {"msg": f"{hint} Letztes Mal: ~{last_w:.1f} kg, Ø{avg_reps:.1f} Wdh., RPE max {max_rpe:.1f}.",
-                "mode":"add_rep","inc":0.0,"base":last_w,"lr":lr,"hr":hr,"tp":tp}
-
-    if many_below_lr:
-        return {"msg": f"Gewicht halten (optional −1–2 kg). Ziel: erst {lr}–{hr} stabil erreichen. Letztes Mal ~{last_w:.1f} kg.",
-                "mode":"add_rep","inc":0.0,"base":last_w,"lr":lr,"hr":hr,"tp":tp}
-
-    if near_top and max_rpe <= 9.0:
-        return {"msg": f"Heute **+1 Wdh./Satz** bei ~{last_w:.1f} kg, bis {hr} erreicht. RPE ok ({max_rpe:.1f}).",
-                "mode":"add_rep","inc":0.0,"base":last_w,"lr":lr,"hr":hr,"tp":tp}
-
-    return {"msg": f"Heute **+1 Wdh./Satz** bei ~{last_w:.1f} kg. Wenn RPE ≤ 9 bleibt, bald +{inc} kg.",
-            "mode":"add_rep","inc":0.0,"base":last_w,"lr":lr,"hr":hr,"tp":tp}
-
-def weeks_since(d: date) -> int:
-    return max(1, (date.today() - d).days // 7 + 1)
-
-def needs_deload(df: pd.DataFrame, block_start: date, every_weeks: int = 8, slip_tol: int = 2):
-    time_flag = (weeks_since(block_start) % every_weeks == 0)
-    slips = 0
-    for t in ["A","B"]:
-        for (name, *_ ) in PLAN[t]:
-            sub = df[(df["tag"]==t) & (df["exercise"]==name)]
-            if sub.empty: continue
-            days = sorted(sub["date"].unique())
-            if len(days) < 2: continue
-            d1, d2 = days[-2], days[-1]
-            u1 = sub[sub["date"]==d1]; u2 = sub[sub["date"]==d2]
-            if u1.empty or u2.empty: continue
-            w1 = float(u1["weight"].max()); w2 = float(u2["weight"].max())
-            if abs(w1 - w2) <= 0.5 and int(u2["reps"].sum()) < int(u1["reps"].sum()):
-                slips += 1
-    fatigue_flag = (slips >= slip_tol)
-    return (time_flag or fatigue_flag), {"time": time_flag, "fatigue": fatigue_flag, "slips": slips}
-
-def undo_last_set_today(tag: str, name: str):
-    dfx = load_log()
+    STORE.append(row)
+
+def undo_last_set_today(tag: str, name: str, slot: int) -> str:
+    u = STORE.index.last(tag, name)
     today = date.today().isoformat()
-    sub = dfx[(dfx["date"]==today) & (dfx["tag"]==tag) & (dfx["exercise"]==name)]
-    if sub.empty:
-        st.info("Heute kein gespeicherter Satz für diese Übung.")
-        return
-    max_set = int(sub["set"].max())
-    dfx = dfx[~((dfx["date"]==today) & (dfx["tag"]==tag) & (dfx["exercise"]==name) & (dfx["set"]==max_set))]
-    save_log(dfx)
+    if u is None or u.date != today:
+        return "Heute kein gespeicherter Satz für diese Übung."
+    max_set = u.sets[-1][0]
+    STORE.delete(today, tag, name, max_set)
     st.session_state["saved_flags"].pop(f"{tag}:{name}:{today}:{max_set}", None)
-    st.success(f"Satz {max_set} zurückgenommen.")
+    st.session_state.pop(f"chk_{tag}_{slot}_{max_set}", None)  # Haken weg, sonst gilt der Satz als offen-gespeichert
+    return f"Satz {max_set} zurückgenommen."
 
 # ------------------------- SIDEBAR -------------------------
 with st.sidebar:
     st.header("⚙️ Einstellungen")
+    athlete = st.selectbox("👤 Athlet", [""] + list_athletes(), key="athlete",
+                           format_func=lambda a: a or "– gemeinsamer Log –")
+    st.text_input("➕ Neuer Athlet", key="new_athlete", on_change=add_athlete)
+    STORE = open_athlete_store(athlete)
+    # Athletenwechsel -> Haken, Eingaben & Auswahl leeren (sonst speichern gesetzte ✅ in die neue Partition)
+    if st.session_state["active_athlete"] != athlete:
+        st.session_state["active_athlete"] = athlete
+        st.session_state["saved_flags"].clear()
+        st.session_state["chosen_map"].clear()
+        st.session_state["focus_anchor"] = ""
+        for k in [k for k in st.session_state if str(k).startswith(("chk_","w_","r_","rpe_","choose_"))]:
+            del st.session_state[k]
+    view = st.radio("Ansicht", ["🏋️ Training", "📈 Analyse"], horizontal=True, key="view")
     tag = st.selectbox("Trainingstag", ["A","B"])
     block_start = st.date_input("Block-Start (für Deload-Timer)", value=date.today())
     deload_every = st.slider("Deload alle X Wochen", 6, 10, 8)
@@ -263,26 +177,83 @@ with st.sidebar:
     st.markdown("---")
     st.subheader("📤 CSV importieren")
     uploaded = st.file_uploader("Vorherige workout_log.csv auswählen", type=["csv"])
-    if uploaded is not None:
+    # Nur der file_id: der Uploader behält die Datei über Reruns, ein Athletenwechsel darf sie nicht erneut importieren
+    if uploaded is not None and st.session_state.get("imported_file") != uploaded.file_id:
         try:
-            df_old = load_log()
-            df_new = pd.read_csv(uploaded)
-            cols = ["date","tag","exercise","set","weight","reps","rpe","note"]
-            for c in cols:
-                if c not in df_new.columns: df_new[c] = None
-            df_all = pd.concat([df_old, df_new[cols]], ignore_index=True).drop_duplicates()
-            save_log(df_all)
-            st.success("CSV importiert – Fortschritt übernommen.")
+            rep = import_csv(STORE, uploaded)
+            st.session_state["imported_file"] = uploaded.file_id
+            st.session_state["import_report"] = rep
         except Exception as e:
             st.error(f"Import fehlgeschlagen: {e}")
+    if uploaded is not None and (rep := st.session_state.get("import_report")):
+        st.success(f"CSV importiert: {rep.added} neu · {rep.duplicate} Duplikate · {rep.rejected} verworfen.")
+    with st.expander("🔄 Mit anderem Gerät abgleichen"):
+        # Nur HTTP-Peers: ein freier Dateipfad könnte beliebige Dateien anlegen oder fremde Partitionen treffen
+        peer = st.text_input("Peer-URL", key="sync_peer", placeholder="http://laptop:8765").strip()
+        token = st.text_input("Token", key="sync_token", type="password")  # nie vorbelegen: Wert geht an den Browser
+        st.caption("Gegenstelle starten: `python sync.py serve <log>` (zeigt das Token an). Übertragen werden nur Änderungen seit dem letzten Abgleich.")
+        http = peer.startswith(("http://", "https://"))
+        if peer and not http:
+            st.warning("Nur HTTP-Peers (http://…); Datei-Logs per `python sync.py run` abgleichen.")
+        if st.button("Jetzt abgleichen", disabled=not (http and token)):
+            try:
+                with PERF.phase("sync"):
+                    rep = sync(STORE, open_peer(peer, token), label=peer)
+                st.success(f"{rep.sent} gesendet · {rep.received} empfangen · {rep.changed} Sätze geändert.")
+            except Exception as e:
+                st.error(f"Abgleich fehlgeschlagen: {e}")
+        if peer and (last := STORE.changes.meta().get("peers", {}).get(peer)):
+            st.caption(f"Letzter Abgleich: {last['at']}")
     st.markdown("---")
     with st.expander("⚠️ Datenverwaltung"):
         confirm = st.checkbox("Ich bestätige, dass ich alle Trainingsdaten löschen möchte.")
         if st.button("🗑️ Alle Daten löschen", disabled=not confirm):
-            save_log(pd.DataFrame(columns=["date","tag","exercise","set","weight","reps","rpe","note"]))
+            save_log(pd.DataFrame(columns=LOG_COLS))
             st.session_state["saved_flags"].clear()
             st.session_state["chosen_map"].clear()
             st.success("Alle Daten wurden gelöscht.")
+        if st.button("🧹 Log kompaktieren"):
+            st.success(f"{STORE.compact()} Journal-Einträge eingearbeitet.")
+    if st.toggle("⏱ Performance", key="perf_panel"):
+        n = st.slider("Letzte Läufe", 5, PERF_KEEP, 20, key="perf_n")
+        st.dataframe(PERF.frame().tail(n).iloc[::-1], use_container_width=True, hide_index=True)
+        st.caption("phases.* = ms je Phase · io.* = Datei-/DB-Zugriffe. Fragment-Läufe erscheinen beim nächsten vollen Rerun.")
+        c1, c2 = st.columns(2)
+        c1.download_button("JSON", data=PERF.to_json, file_name="perf.json", mime="application/json", on_click="ignore")
+        c2.download_button("CSV", data=PERF.to_csv, file_name="perf.csv", mime="text/csv", on_click="ignore")
+
+# ------------------------- ANALYSE (nur aus den Rollups, kein Log-Scan je Rerun) -------------------------
+def render_analytics():
+    st.title("📈 Analyse")
+    with PERF.phase("rollups"):
+        weeks, prs = STORE.rollups.weeks(), STORE.rollups.prs()
+    if weeks.empty:
+        st.info("Noch nichts geloggt.")
+        return
+    logged = set(weeks["exercise"])
+    c1, c2 = st.columns(2)
+    an_tags = c1.multiselect("Tage", sorted(set(weeks["tag"])), default=sorted(set(weeks["tag"])), key="an_tags")
+    an_ex = c2.multiselect("Übungen", sorted(logged), key="an_ex",
+                           default=[n for n, *_ in PLAN[tag] if n in logged][:3])
+    w = weeks[weeks["tag"].isin(an_tags) & weeks["exercise"].isin(an_ex)]
+    if w.empty:
+        st.info("Keine Daten für die Auswahl.")
+        return
+    st.subheader("Tonnage je Woche (kg × Wdh.)")
+    st.bar_chart(w.pivot_table(index="week", columns="exercise", values="tonnage", aggfunc="sum"))
+    st.subheader("Bestes e1RM je Woche (kg)")
+    st.line_chart(w.pivot_table(index="week", columns="exercise", values="best_e1rm", aggfunc="max"))
+    st.subheader("Sätze je Woche")
+    st.bar_chart(w.pivot_table(index="week", columns="tag", values="sets", aggfunc="sum"))
+    st.subheader("🏆 PR-Verlauf")
+    p = prs[prs["exercise"].isin(an_ex)].iloc[::-1].head(50)
+    st.dataframe(p.round({"e1rm": 1}), use_container_width=True, hide_index=True)
+    st.caption("e1RM nach Epley, Wdh. in Reserve (10 − RPE) zählen als mögliche Wdh. mit.")
+
+if view == "📈 Analyse":
+    render_analytics()
+    PERF.end()
+    st.stop()
 
 # ------------------------- HEADER -------------------------
 st.title("🏋️ Progressions-Coach (A/B)")
@@ -290,49 +261,120 @@ st.write(f"**Heute:** {date.today().isoformat()}  ·  **Tag {tag}**")
 st.caption("Double-Progression (Reps zuerst, dann Gewicht). Coach berücksichtigt RPE + Reps. Deload bei Woche X oder Leistungseinbruch.")
 
 # ------------------------- DELOAD HINWEIS -------------------------
-df = load_log()
-flag, meta = needs_deload(df, block_start, deload_every, slip_tol=2)
+# Index der letzten zwei Einheiten je (Tag, Übung) – reicht für Coach, Deload & heutigen Fortschritt
+idx = STORE.index
+with PERF.phase("load_log"):
+    idx.ensure([(t, n) for t in PLAN for n in EXERCISE_POOL])
+with PERF.phase("needs_deload"):
+    flag, meta = needs_deload(idx.frame((t, n) for t in PLAN for (n, *_ ) in PLAN[t]), block_start, deload_every, slip_tol=2)
 if flag:
     reason = "Kalender" if meta["time"] else ""
     if meta["fatigue"]:
         reason += (" & " if reason else "") + f"Leistungsabfall ({meta['slips']})"
     st.warning(f"🔻 Deload empfohlen: {reason}. Vorschlag: ~{deload_drop}% weniger Gewicht, Sätze −30–50 %, 3–4 Wdh. in Reserve.")
 
-# ------------------------- AUTOPILOT: ggf. scrollen -------------------------
-if st.session_state["focus_anchor"]:
-    st.components.v1.html(f"""
-    <script>
-      const el = window.parent.document.getElementById("{st.session_state['focus_anchor']}");
-      if (el) el.scrollIntoView({{behavior:'smooth', block:'center'}});
-    </script>
-    """, height=0)
-
-# ------------------------- TAGES-FORTSCHRITT -------------------------
+# ------------------------- AUTOPILOT + TAGES-FORTSCHRITT -------------------------
 today_str = date.today().isoformat()
-target_today = sum(SETS_MAIN if tp=="main" else SETS_ISO for (_,_,_,_,tp) in PLAN[tag])
-done_today = len(df[(df["date"]==today_str) & (df["tag"]==tag)])
-st.progress(min(done_today/target_today, 1.0))
-st.caption(f"Heute erledigt: **{done_today}/{target_today} Sätze**")
 
-# ------------------------- PRO ÜBUNG -------------------------
-for i, (orig_name, lr, hr, inc, tp) in enumerate(PLAN[tag], start=1):
+@st.fragment(key="progress")
+@PERF.timed("progress")
+def render_progress(tag: str):
+    # Eigenes Fragment: läuft bei Speichern/Undo/Tausch einer Übung mit, ohne den Rest der Seite
+    if st.session_state["focus_anchor"]:
+        st.components.v1.html(f"""
+        <script>
+          const el = window.parent.document.getElementById("{st.session_state['focus_anchor']}");
+          if (el) el.scrollIntoView({{behavior:'smooth', block:'center'}});
+        </script>
+        """, height=0)
+    today = date.today().isoformat()
+    target_today = sum(SETS_MAIN if tp=="main" else SETS_ISO for (_,_,_,_,tp) in PLAN[tag])
+    done_today = sum(len(u.sets) for u in (idx.last(tag, n) for n in EXERCISE_POOL) if u is not None and u.date == today)
+    st.progress(min(done_today/target_today, 1.0))
+    st.caption(f"Heute erledigt: **{done_today}/{target_today} Sätze**")
+
+render_progress(tag)
+
+# ------------------------- COACH: alle Übungen des Tages in einem Durchgang -------------------------
+# Aktuelle Auswahl je Slot (Widget-State ist vor dem Rendern schon gesetzt)
+chosen_today = {i: st.session_state.get(f"choose_{tag}_{i}_{today_str}",
+                                        st.session_state["chosen_map"].get((tag, i, today_str), n))
+                for i, (n, *_ ) in enumerate(PLAN[tag], start=1)}
+with PERF.phase("suggest_day"):
+    suggestions = suggest_day_index(idx, tag, chosen_today)
+
+# ------------------------- PRO ÜBUNG (je ein Fragment) -------------------------
+def rerun_block(tag: str, i: int):
+    """Nur diese Übung + Fortschritt + Timer neu zeichnen (aus Widget-Callbacks)."""
+    st.rerun([f"ex_{tag}_{i}", "progress", "timer"])
+
+def choose_exercise(tag: str, i: int):
+    st.session_state["chosen_map"][(tag, i, today_str)] = st.session_state[f"choose_{tag}_{i}_{today_str}"]
+    rerun_block(tag, i)
+
+@PERF.timed("save")
+def save_set(tag: str, i: int, s: int, name: str, target_sets: int):
+    """✅ -> Satz speichern, Auto-Pause starten, Autopilot weiterschieben."""
+    today = date.today().isoformat()
+    flag_key = f"{tag}:{name}:{today}:{s}"
+    u = idx.last(tag, name)
+    saved_count = max((x[0] for x in u.sets), default=0) if (u is not None and u.date == today) else 0
+    if not st.session_state.get(f"chk_{tag}_{i}_{s}") or st.session_state["saved_flags"].get(flag_key) or s <= saved_count:
+        rerun_block(tag, i)
+
+    append_row({
+        "date": today,
+        "tag": tag,
+        "exercise": name,  # echte (ggf. getauschte) Übung
+        "set": max(saved_count + 1, s),
+        "weight": float(st.session_state[f"w_{tag}_{i}_{s}"]),
+        "reps": int(st.session_state[f"r_{tag}_{i}_{s}"]),
+        "rpe": float(st.session_state[f"rpe_{tag}_{i}_{s}"]),
+        "note": ""
+    })
+    st.session_state["saved_flags"][flag_key] = True
+
+    # Auto-Pause nach ✅
+    secs = int(st.session_state.get("auto_timer_seconds", 0))
+    if secs > 0:
+        start_timer(secs)
+
+    # Autopilot: nächste Ziel-Position
+    if st.session_state["autopilot"]:
+        if s < target_sets:
+            st.session_state["focus_anchor"] = f"a_{tag}_{i}_{s+1}"
+        else:
+            st.session_state["focus_anchor"] = f"ex_{i+1}" if i < len(PLAN[tag]) else ""
+    rerun_block(tag, i)
+
+@PERF.timed("undo")
+def undo_set(tag: str, i: int, name: str):
+    st.session_state[f"undo_msg_{tag}_{i}"] = undo_last_set_today(tag, name, i)
+    rerun_block(tag, i)
+
+def exercise_block(tag: str, i: int, orig_name: str, lr: int, hr: int, inc: float, tp: str, planned: tuple):
+    """Eine Übung des Tages; `planned` = (Übung, Store-Version, Vorschlag) aus suggest_day des vollen Laufs."""
     # Übung heute wählen (Tausch möglich)
     choose_key = (tag, i, today_str)
     default_name = st.session_state["chosen_map"].get(choose_key, orig_name)
     chosen_name = st.selectbox(f"Übung {i} heute:", EXERCISE_POOL,
                                index=EXERCISE_POOL.index(default_name) if default_name in EXERCISE_POOL else 0,
-                               key=f"choose_{tag}_{i}_{today_str}")
+                               key=f"choose_{tag}_{i}_{today_str}", on_change=choose_exercise, args=(tag, i))
     st.session_state["chosen_map"][choose_key] = chosen_name
 
-    # Coach-Empfehlung (bei Tausch: Range des Originals als Fallback)
-    sug = suggest_target(df, tag, chosen_name, fallback_meta=(lr,hr,inc,tp))
+    # Coach-Empfehlung; nach Tausch oder neuem Satz nur diese Übung neu rechnen (Range des Originals als Fallback)
+    with PERF.phase("suggest_unit"):
+        sug = planned[2] if planned[:2] == (chosen_name, STORE.version) else \
+              suggest_unit(idx.last(tag, chosen_name), tag, chosen_name, fallback_meta=(lr,hr,inc,tp))
 
     # Wie viele Sätze heute?
     target_sets = sets_target(tp)
 
-    # Heutige Sätze (für Farbe & Defaults)
-    today_sets = df[(df["date"]==today_str) & (df["tag"]==tag) & (df["exercise"]==chosen_name)]
-    saved_count = 0 if today_sets.empty else int(today_sets["set"].max())
+    # Heutige Sätze (für Farbe & Defaults): set -> (weight, reps)
+    with PERF.phase("last_unit"):
+        last_u = idx.last(tag, chosen_name)
+    today_sets = {s: (w, r) for s, w, r, _ in last_u.sets} if (last_u is not None and last_u.date == today_str) else {}
+    saved_count = max(today_sets, default=0)
 
     # Box-Farbe
     if saved_count == 0:            box_bg = "#2b2b2b"
@@ -352,99 +394,87 @@ for i, (orig_name, lr, hr, inc, tp) in enumerate(PLAN[tag], start=1):
     )
 
     # Kompakte Zusammenfassung der letzten Einheit (lesbar, nicht überladen)
-    last_date, summary_text, summary_df = build_last_summary(df, tag, chosen_name)
+    with PERF.phase("build_last_summary"):
+        last_date, summary_text, summary_df = build_last_summary(idx, tag, chosen_name)
     if last_date and summary_text:
         st.caption(f"Letzte Einheit ({last_date}): {summary_text}")
         with st.expander("Details anzeigen", expanded=False):
             st.dataframe(summary_df, use_container_width=True)
 
     # Standard-Defaults aus letzter Einheit
-    _, last_u = last_unit(df, tag, chosen_name)
-    last_weight = float(last_u["weight"].max()) if (last_u is not None and not last_u.empty) else 0.0
+    last_weight = last_u.weight if last_u is not None else 0.0
     base_w = float(sug.get("base", last_weight))
     base_r = lr
 
     st.write("")  # Abstand
 
     # Satz-Zeilen
-    for s in range(1, target_sets + 1):
-        anchor_id = f"a_{tag}_{i}_{s}"
-        st.markdown(f"<div id='{anchor_id}'></div>", unsafe_allow_html=True)
-
-        flag_key = f"{tag}:{chosen_name}:{today_str}:{s}"
-        stored_already = st.session_state["saved_flags"].get(flag_key, False) or (s <= saved_count)
-
-        # Defaults aus vorherigem Satz heute übernehmen
-        if s > 1:
-            prev = df[(df["date"]==today_str) & (df["tag"]==tag) & (df["exercise"]==chosen_name) & (df["set"]==s-1)]
-            if not prev.empty:
-                base_w = float(prev["weight"].iloc[0])
-                base_r = int(prev["reps"].iloc[0])
-
-        c1, c2, c3, c4 = st.columns([1.3, 0.8, 0.9, 0.7])
-        w = c1.number_input(f"Satz {s} – Gewicht (kg)", min_value=0.0, step=0.5,
+    with PERF.phase("set_loop"):
+        for s in range(1, target_sets + 1):
+            anchor_id = f"a_{tag}_{i}_{s}"
+            st.markdown(f"<div id='{anchor_id}'></div>", unsafe_allow_html=True)
+
+            flag_key = f"{tag}:{chosen_name}:{today_str}:{s}"
+            stored_already = st.session_state["saved_flags"].get(flag_key, False) or (s <= saved_count)
+
+            # Defaults aus vorherigem Satz heute übernehmen
+            if s > 1 and (s-1) in today_sets:
+                base_w = float(today_sets[s-1][0])
+                base_r = int(today_sets[s-1][1])
+
+            c1, c2, c3, c4 = st.columns([1.3, 0.8, 0.9, 0.7])
+            c1.number_input(f"Satz {s} – Gewicht (kg)", min_value=0.0, step=0.5,
                             value=base_w, key=f"w_{tag}_{i}_{s}", disabled=stored_already)
-        r = c2.number_input("Wdh.", min_value=0, step=1,
+            c2.number_input("Wdh.", min_value=0, step=1,
                             value=base_r, key=f"r_{tag}_{i}_{s}", disabled=stored_already)
-        rpe = c3.slider("RPE", 5.0, 10.0, 8.0, 0.5,
-                        key=f"rpe_{tag}_{i}_{s}", disabled=stored_already)
-        save_now = c4.checkbox("✅", value=stored_already, key=f"chk_{tag}_{i}_{s}")
-
-        # Speichern + Autopilot vorwärts springen
-        if save_now and not stored_already:
-            sub_today = df[(df["date"]==today_str) & (df["tag"]==tag) & (df["exercise"]==chosen_name)]
-            next_set = 1 if sub_today.empty else int(sub_today["set"].max()) + 1
-            set_number = max(next_set, s)
-
-            append_row({
-                "date": today_str,
-                "tag": tag,
-                "exercise": chosen_name,  # echte (ggf. getauschte) Übung
-                "set": set_number,
-                "weight": float(w),
-                "reps": int(r),
-                "rpe": float(rpe),
-                "note": ""
-            })
-            st.session_state["saved_flags"][flag_key] = True
-
-            # Auto-Pause nach ✅
-            secs = int(st.session_state.get("auto_timer_seconds", 0))
-            if secs > 0:
-                st.session_state["timer_start"] = datetime.utcnow()
-                st.session_state["timer_end"]   = st.session_state["timer_start"] + timedelta(seconds=secs)
-
-            # Autopilot: nächste Ziel-Position
-            if st.session_state["autopilot"]:
-                if s < target_sets:
-                    st.session_state["focus_anchor"] = f"a_{tag}_{i}_{s+1}"
-                else:
-                    st.session_state["focus_anchor"] = f"ex_{i+1}" if i < len(PLAN[tag]) else ""
-            df = load_log()
-            st.rerun()
+            c3.slider("RPE", 5.0, 10.0, 8.0, 0.5,
+                      key=f"rpe_{tag}_{i}_{s}", disabled=stored_already)
+            # Speichern + Autopilot im Callback
+            c4.checkbox("✅", value=stored_already, key=f"chk_{tag}_{i}_{s}",
+                        on_change=save_set, args=(tag, i, s, chosen_name, target_sets))
 
     # Undo (nur diese Übung, heute)
-    if st.button("↩️ Letzten Satz (heute) zurücknehmen", key=f"undo_btn_{tag}_{i}"):
-        undo_last_set_today(tag, chosen_name)
-        df = load_log()
-        st.rerun()
+    st.button("↩️ Letzten Satz (heute) zurücknehmen", key=f"undo_btn_{tag}_{i}",
+              on_click=undo_set, args=(tag, i, chosen_name))
+    msg = st.session_state.pop(f"undo_msg_{tag}_{i}", None)
+    if msg:
+        (st.success if msg.startswith("Satz") else st.info)(msg)
+
+for i, (orig_name, lr, hr, inc, tp) in enumerate(PLAN[tag], start=1):
+    st.fragment(PERF.timed(f"ex_{tag}_{i}")(exercise_block), key=f"ex_{tag}_{i}")(
+        tag, i, orig_name, lr, hr, inc, tp, (chosen_today[i], STORE.version, suggestions[i]))
 
 # ------------------------- VERLAUF & EXPORT -------------------------
 st.markdown("---")
 with st.expander("📒 Letzte 30 Einträge"):
-    hist = load_log()
+    with PERF.phase("history"):
+        hist = STORE.tail(30)
     if hist.empty:
         st.info("Noch nichts geloggt.")
     else:
-        st.dataframe(hist.tail(30), use_container_width=True)
-
-csv_bytes = load_log().to_csv(index=False).encode("utf-8")
-st.download_button(
-    "📥 CSV exportieren",
-    data=csv_bytes,
-    file_name=f"workout_log_{date.today().isoformat()}.csv",
-    mime="text/csv"
-)
+        st.dataframe(hist, use_container_width=True)
+
+with st.expander("📥 CSV exportieren"):
+    c1, c2 = st.columns(2)
+    exp_from = c1.date_input("Von", value=None, key="exp_from")
+    exp_to = c2.date_input("Bis", value=None, key="exp_to")
+    exp_tags = st.multiselect("Tage", list(PLAN), key="exp_tags")
+    exp_ex = st.multiselect("Übungen", EXERCISE_POOL, key="exp_ex")
+    exp_gz = st.checkbox("gzip-komprimiert", key="exp_gz")
+    # Erst beim Klick gebaut (eigener Thread), blockweise in eine Temp-Datei serialisiert
+    @PERF.timed("export")
+    def build_export():
+        return export_csv_file(STORE, exp_from, exp_to, exp_tags, exp_ex, gzip=exp_gz)
+
+    st.download_button(
+        "📥 CSV exportieren",
+        data=build_export,
+        file_name=f"workout_log_{date.today().isoformat()}.csv" + (".gz" if exp_gz else ""),
+        mime="application/gzip" if exp_gz else "text/csv",
+        on_click="ignore",
+    )
 
 st.caption("Tipps: Neutrale Griffe bei Reizung, kein harter Lockout, langsame Negative. "
-           "Deload: Gewicht −30–40 %, Sätze −30–50 %, 3–4 Wdh. in Reserve.")
\ No newline at end of file
+           "Deload: Gewicht −30–40 %, Sätze −30–50 %, 3–4 Wdh. in Reserve.")
+
+PERF.end()
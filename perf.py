@@ -0,0 +1,84 @@
+"""Laufzeit je Rerun: benannte Phasen + I/O-Zähler, Ringpuffer der letzten N Läufe, Dump als JSON/CSV.
+
+    PERF = Recorder(keep=50, counters=storage.io_counts)
+    PERF.begin("app")
+    with PERF.phase("needs_deload"): ...
+    PERF.end()
+"""
+import functools
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+class Recorder:
+    """Misst pro Lauf (App-Rerun oder Fragment) die Summe je Phase und die Differenz der I/O-Zähler."""
+
+    def __init__(self, keep: int = 50, counters=None):
+        self.runs = deque(maxlen=keep)
+        self.counters = counters or dict  # -> {art: anzahl}, z. B. storage.io_counts
+        self._cur = None
+
+    def begin(self, label: str):
+        if self._cur is not None:  # Vorheriger Lauf abgebrochen (st.rerun, Exception)
+            self._close(complete=False)
+        self._cur = {"ts": datetime.now().isoformat(timespec="seconds"), "run": label,
+                     "t0": time.perf_counter(), "io0": self.counters(), "phases": {}}
+
+    def end(self):
+        if self._cur is not None:
+            self._close(complete=True)
+
+    def _close(self, complete: bool):
+        cur, self._cur = self._cur, None
+        io0 = cur.pop("io0")
+        io = {k: n - io0.get(k, 0) for k, n in self.counters().items() if n - io0.get(k, 0)}
+        self.runs.append({"ts": cur["ts"], "run": cur["run"], "complete": complete,
+                          "total_ms": round((time.perf_counter() - cur["t0"]) * 1000, 3),
+                          "phases": {k: round(v, 3) for k, v in cur["phases"].items()}, "io": io})
+
+    @contextmanager
+    def phase(self, name: str):
+        """Addiert die Dauer auf die Phase `name` des laufenden Laufs (mehrfach je Lauf möglich)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            cur = self._cur
+            if cur is not None:
+                cur["phases"][name] = cur["phases"].get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+    @contextmanager
+    def run(self, label: str):
+        """Eigener Lauf, falls keiner offen ist (Fragment-Rerun); innerhalb eines App-Reruns nur Teil davon."""
+        own = self._cur is None
+        if own: self.begin(label)
+        try:
+            yield
+        finally:
+            if own: self.end()
+
+    def timed(self, label: str):
+        """Decorator-Variante von run(), z. B. für st.fragment-Funktionen (Name bleibt erhalten)."""
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.run(label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    def frame(self) -> pd.DataFrame:
+        """Ein Lauf je Zeile; Spalten phases.<name> (ms) und io.<art> (Anzahl)."""
+        if not self.runs:
+            return pd.DataFrame(columns=["ts","run","complete","total_ms"])
+        return pd.json_normalize(list(self.runs))
+
+    def to_json(self) -> str:
+        return json.dumps({"created": datetime.now().isoformat(timespec="seconds"), "runs": list(self.runs)}, indent=1)
+
+    def to_csv(self) -> str:
+        return self.frame().to_csv(index=False)
@@ -0,0 +1,1146 @@
+"""Speicher-Backends für den Trainings-Log (CSV mit Journal oder SQLite)."""
+import bisect
+import csv
+import io
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import urllib.request
+import zlib
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from operator import attrgetter
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+from analytics import Rollups
+
+try:
+    import pyarrow  # Parquet-Archiv, optional
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = pq = None
+
+LOG_COLS = ["date","tag","exercise","set","weight","reps","rpe","note"]
+KEY_COLS = ["date","tag","exercise","set"]
+COMPACT_AFTER = 500  # Journal-Zeilen, ab denen CsvStore.load() kompaktiert
+IMPORT_CHUNK = 50_000  # Zeilen je Block beim CSV-Import
+EXPORT_CHUNK = 20_000  # Zeilen je Block beim CSV-Export
+ATHLETES_DIR = "athletes"  # je Athlet ein Unterordner mit eigener Log-Partition
+
+_io = threading.local()
+
+def _count(kind: str):
+    if not hasattr(_io, "counts"): _io.counts = Counter()
+    _io.counts[kind] += 1
+
+def io_counts() -> dict:
+    """Bisherige Lese-/Schreibzugriffe dieses Threads je Art (csv_read, csv_write, sqlite_read, …)."""
+    return dict(getattr(_io, "counts", {}))
+
+def _read_csv(path: str, cols) -> pd.DataFrame:
+    if os.path.exists(path):
+        _count("csv_read")
+        try:
+            df = pd.read_csv(path)
+            for c in cols:
+                if c not in df.columns: df[c] = None
+            return df[cols]
+        except Exception:
+            return pd.DataFrame(columns=cols)
+    return pd.DataFrame(columns=cols)
+
+def _last_sessions(df: pd.DataFrame, pairs, sessions: int) -> pd.DataFrame:
+    """Zeilen der letzten `sessions` Trainingstage je (tag, exercise) aus `pairs`."""
+    if df.empty:
+        return df
+    want = pd.DataFrame(list(pairs), columns=["tag","exercise"]).drop_duplicates()
+    d = df[["tag","exercise","date"]].drop_duplicates().merge(want, on=["tag","exercise"])
+    d = d.sort_values("date", ascending=False)
+    d = d[d.groupby(["tag","exercise"]).cumcount() < sessions]
+    return df.merge(d, on=["tag","exercise","date"])[LOG_COLS]
+
+# ------------------------- INDEX: letzte Einheiten je Übung -------------------------
+# sets: ((set, weight, reps, rpe), ...) nach Satz sortiert; weight/rpe = Maximum, reps = Liste je Satz
+Session = namedtuple("Session", "date sets weight reps rpe reps_sum")
+
+def _session(date: str, sets: list) -> Session:
+    rows = tuple(sorted(sets, key=lambda x: x[0]))
+    weights = [float(w) for _, w, _, _ in rows if pd.notnull(w)]
+    reps    = [int(r)   for _, _, r, _ in rows if pd.notnull(r)]
+    rpes    = [float(e) for _, _, _, e in rows if pd.notnull(e)]
+    return Session(date, rows, max(weights) if weights else float("nan"), reps,
+                   max(rpes) if rpes else None, sum(reps))
+
+class SessionIndex:
+    """Die letzten `depth` Einheiten je (tag, exercise) als Aggregate.
+
+    Wird bei append/delete des Stores nachgeführt statt bei jedem Rerun aus dem ganzen Log berechnet;
+    fehlende Übungen werden beim ersten Zugriff per `store.recent()` nachgeladen.
+    """
+
+    def __init__(self, store=None, depth: int = 2):
+        self.store, self.depth = store, depth
+        self._sets = {}   # (tag, exercise) -> {date: [(set, weight, reps, rpe), ...]}
+        self._units = {}  # (tag, exercise) -> [Session, ...] (alt -> neu)
+        self._lock = store._lock if store is not None else threading.RLock()  # ein Lock je Store
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, depth: int = 2) -> "SessionIndex":
+        """Index ohne Store, z. B. für Auswertungen außerhalb der App."""
+        idx = cls(None, depth)
+        pairs = list(df[["tag","exercise"]].drop_duplicates().itertuples(index=False, name=None))
+        idx._fill(_last_sessions(df, pairs, depth), pairs)
+        return idx
+
+    def _fill(self, rows: pd.DataFrame, pairs):
+        for key in pairs:
+            self._sets[key] = {}
+        for d, t, ex, s, w, r, e in rows[["date","tag","exercise","set","weight","reps","rpe"]].itertuples(index=False):
+            if pd.isna(s): continue  # Alt-Log ohne Satznummer (wie _keyset)
+            self._sets[(t, ex)].setdefault(d, []).append((int(s), w, r, e))
+        for key in pairs:
+            self._refresh(key)
+
+    def _refresh(self, key):
+        units = self._sets[key]
+        for d in sorted(units)[:-self.depth]:
+            del units[d]
+        self._units[key] = [_session(d, units[d]) for d in sorted(units)]
+
+    def ensure(self, pairs):
+        """Lädt noch nicht indizierte (tag, exercise)-Paare in einem Rutsch nach."""
+        with self._lock:
+            if self.store is not None:
+                self.store.refresh()
+            missing = [p for p in dict.fromkeys(pairs) if p not in self._sets]
+            if not missing:
+                return
+            rows = self.store.recent(missing, self.depth) if self.store is not None else pd.DataFrame(columns=LOG_COLS)
+            self._fill(rows, missing)
+
+    def sessions(self, tag: str, exercise: str) -> list:
+        """Bis zu `depth` letzte Einheiten (alt -> neu)."""
+        self.ensure([(tag, exercise)])
+        with self._lock:
+            return list(self._units[(tag, exercise)])
+
+    def frame(self, pairs) -> pd.DataFrame:
+        """Index-Einheiten der `pairs` als Tabelle im Format von `coach.session_table`."""
+        pairs = list(dict.fromkeys(pairs))
+        self.ensure(pairs)
+        with self._lock:
+            rows = [(t, ex, u.date, u.weight, u.reps_sum, u.rpe, len(u.sets))
+                    for t, ex in pairs for u in self._units[(t, ex)]]
+        return pd.DataFrame(rows, columns=["tag","exercise","date","weight","reps_sum","rpe","sets"])
+
+    def rows(self, pairs) -> pd.DataFrame:
+        """Roh-Sätze der indizierten Einheiten der `pairs` (Spalten wie LOG_COLS), z. B. für `coach.suggest_batch`."""
+        pairs = list(dict.fromkeys(pairs))
+        self.ensure(pairs)
+        with self._lock:
+            rows = [(u.date, t, ex, s, w, r, e, None)
+                    for t, ex in pairs for u in self._units[(t, ex)] for s, w, r, e in u.sets]
+        return pd.DataFrame(rows, columns=LOG_COLS)
+
+    def last(self, tag: str, exercise: str):
+        u = self.sessions(tag, exercise)
+        return u[-1] if u else None
+
+    def on_append(self, row: dict):
+        key = (row["tag"], row["exercise"])
+        with self._lock:
+            if key not in self._sets: return
+            self._sets[key].setdefault(row["date"], []).append((int(row["set"]), row.get("weight"), row.get("reps"), row.get("rpe")))
+            self._refresh(key)
+
+    def on_delete(self, date: str, tag: str, exercise: str, set_no: int):
+        key = (tag, exercise)
+        with self._lock:
+            units = self._sets.get(key, {})
+            if date not in units: return
+            units[date] = [x for x in units[date] if x[0] != int(set_no)]
+            if units[date]:
+                self._refresh(key)
+            else:  # Einheit leer -> ältere Einheit rückt nach, beim nächsten Zugriff neu laden
+                self._sets.pop(key); self._units.pop(key)
+
+    def reset(self):
+        with self._lock:
+            self._sets.clear(); self._units.clear()
+
+class _FileLock:
+    """Exklusiver, prozessübergreifender Lock über eine Sperrdatei; im selben Thread wiederbetretbar."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = None
+        self._depth = 0
+
+    def acquire(self):
+        self._depth += 1
+        if self._depth > 1: return
+        self._f = open(self.path, "a+")
+        if fcntl:
+            fcntl.flock(self._f, fcntl.LOCK_EX)
+        else:
+            self._f.seek(0); msvcrt.locking(self._f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def release(self):
+        self._depth -= 1
+        if self._depth: return
+        if fcntl:
+            fcntl.flock(self._f, fcntl.LOCK_UN)
+        else:
+            self._f.seek(0); msvcrt.locking(self._f.fileno(), msvcrt.LK_UNLCK, 1)
+        self._f.close()
+        self._f = None
+
+def _atomic_tmp(path: str) -> str:
+    """Eindeutige Temp-Datei neben `path` für write-and-rename (mehrere Schreiber kollidieren nicht)."""
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    return tmp
+
+# ------------------------- CHANGELOG (Delta-Sync zwischen Geräten) -------------------------
+CHANGE_COLS = ["device","seq","clock","op"] + LOG_COLS  # op: "add" (Satz) / "del" (Undo)
+Change = namedtuple("Change", CHANGE_COLS)
+
+def _none(v):
+    return None if v is None or (not isinstance(v, str) and pd.isna(v)) else v
+
+def _norm(row: dict):
+    """Zeile -> LOG_COLS-Tupel mit festen Typen (vergleichbar über Geräte und Backends); None ohne Schlüssel."""
+    v = {c: _none(row.get(c)) for c in LOG_COLS}
+    if any(v[c] is None for c in KEY_COLS):
+        return None
+    num = lambda c, f: None if v[c] is None else f(float(v[c]))
+    return (str(v["date"])[:10], str(v["tag"]), str(v["exercise"]), int(float(v["set"])),
+            num("weight", float), num("reps", int), num("rpe", float), "" if v["note"] is None else str(v["note"]))
+
+def _parse(f: list) -> Change:
+    opt = lambda x, t: t(float(x)) if x != "" else None
+    return Change(f[0], int(f[1]), int(f[2]), f[3], f[4], f[5], f[6], int(f[7]),
+                  opt(f[8], float), opt(f[9], int), opt(f[10], float), f[11])
+
+class ChangeLog:
+    """Änderungsprotokoll eines Stores für den Delta-Sync (`<log>.changes.csv`, nur angehängt).
+
+    Jede Änderung trägt (device, seq) – seq zählt je Gerät hoch – und eine Lamport-Uhr `clock`. Geräte tauschen
+    nur aus, was der andere laut `vector()` noch nicht kennt. Je Schlüssel (date, tag, exercise, set) gilt die
+    Änderung mit dem größten (clock, device): auf allen Geräten dasselbe Ergebnis, egal in welcher Reihenfolge.
+    Aus, bis `enable()` den bestehenden Log einmalig als Änderungen dieses Geräts übernimmt.
+
+    Schreiben braucht nur den Kopf (Uhr + höchste seq je Gerät bis Byte `off`), der in `.sync.json` mitgeführt
+    wird; das ganze Protokoll wird erst für `since`/`receive` gelesen.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.path = store.path + ".changes.csv"
+        self.meta_path = store.path + ".sync.json"  # Geräte-ID + letzter Abgleich je Peer
+        self._device = None
+        self._head = None  # {"off", "clock", "vector"}; None = noch nicht aus .sync.json gelesen
+        self._reset()
+
+    def _reset(self):
+        self._off = 0     # bis hierhin gelesen (Bytes)
+        self._log = {}    # device -> [Change, ...] nach seq
+        self._win = {}    # (date, tag, exercise, set) -> gültige Change
+
+    @property
+    def enabled(self) -> bool:
+        return os.path.exists(self.path)
+
+    def meta(self) -> dict:
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, meta: dict):
+        tmp = _atomic_tmp(self.meta_path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, self.meta_path)
+
+    @property
+    def device(self) -> str:
+        if self._device is None:
+            self._device = self.meta().get("device")
+        return self._device
+
+    def enable(self):
+        """Schaltet das Protokoll ein; der bestehende Log wird einmalig als Änderungen dieses Geräts übernommen."""
+        with self.store.locked():
+            if self.enabled: return
+            meta = self.meta()
+            meta.setdefault("device", os.urandom(4).hex())
+            meta.pop("head", None)
+            self._write_meta(meta)
+            self._device = meta["device"]
+            self._head = None
+            self._reset()
+            df = self.store.load()
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(CHANGE_COLS)
+            self._record("add", df.to_dict("records"))
+
+    def note_peer(self, peer: str, **info):
+        with self.store.locked():
+            meta = self.meta()
+            meta.setdefault("peers", {})[peer] = info
+            self._write_meta(meta)
+
+    def _read_from(self, off: int):
+        """(Änderungen ab Byte `off`, Dateigröße); None, wenn die Datei kürzer ist (neu angelegt)."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return None
+        if size < off: return None
+        if size == off: return [], size
+        _count("csv_read")
+        with open(self.path, "rb") as f:
+            f.seek(off)
+            data = f.read()
+        rows = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        if off == 0: next(rows, None)  # Kopfzeile
+        return [_parse(r) for r in rows if r], off + len(data)
+
+    def _catch_up(self):
+        """Ganzes Protokoll im Speicher nachführen; liest nur die seit dem letzten Mal angehängten Zeilen."""
+        got = self._read_from(self._off)
+        if got is None:
+            self._reset()
+            got = self._read_from(0) or ([], 0)
+        for ch in got[0]:
+            self._add(ch)
+        self._off = got[1]
+
+    def _add(self, ch: Change):
+        self._log.setdefault(ch.device, []).append(ch)
+        key = (ch.date, ch.tag, ch.exercise, ch.set)
+        w = self._win.get(key)
+        if w is None or (ch.clock, ch.device) > (w.clock, w.device):
+            self._win[key] = ch
+
+    def _head_up(self) -> dict:
+        """Kopf auf Dateistand bringen: gespeicherter Kopf + nur die Zeilen dahinter (andere Prozesse schreiben mit)."""
+        if self._head is None:
+            h = self.meta().get("head") or {}
+            self._head = {"off": int(h.get("off", 0)), "clock": int(h.get("clock", 0)), "vector": dict(h.get("vector", {}))}
+        got = self._read_from(self._head["off"])
+        if got is None:
+            self._head = {"off": 0, "clock": 0, "vector": {}}
+            got = self._read_from(0) or ([], 0)
+        self._fold(got[0])
+        self._head["off"] = got[1]
+        return self._head
+
+    def _fold(self, changes):
+        h = self._head
+        for ch in changes:
+            h["clock"] = max(h["clock"], ch.clock)
+            h["vector"][ch.device] = max(h["vector"].get(ch.device, 0), ch.seq)
+
+    def _write(self, changes: list):
+        _count("csv_write")
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            start = f.tell()
+            csv.writer(f).writerows(changes)
+            end = f.tell()
+        if self._off == start:  # ganzes Protokoll ist geladen und aktuell
+            for ch in changes:
+                self._add(ch)
+            self._off = end
+        if self._head is not None and self._head["off"] == start:
+            self._fold(changes)
+            self._head["off"] = end
+            meta = self.meta()
+            meta["head"] = self._head
+            self._write_meta(meta)
+
+    def _record(self, op: str, rows):
+        with self.store.locked():
+            if not self.enabled: return
+            h = self._head_up()
+            dev = self.device
+            clock, seq = h["clock"], h["vector"].get(dev, 0)
+            out = []
+            for r in filter(None, map(_norm, rows)):
+                clock += 1; seq += 1
+                out.append(Change(dev, seq, clock, op, *r))
+            if out: self._write(out)
+
+    def on_append(self, row: dict):
+        self._record("add", [row])
+
+    def on_extend(self, df: pd.DataFrame):
+        if self.enabled: self._record("add", df.to_dict("records"))
+
+    def on_delete(self, date: str, tag: str, exercise: str, set_no: int):
+        self._record("del", [{"date": date, "tag": tag, "exercise": exercise, "set": set_no}])
+
+    def on_save(self, old: pd.DataFrame, new: pd.DataFrame):
+        """Log komplett neu geschrieben (z. B. „Alle Daten löschen“): nur die Differenz wird protokolliert."""
+        if not self.enabled: return
+        before = {r[:4]: r for r in map(_norm, old.to_dict("records")) if r}
+        after = {r[:4]: r for r in map(_norm, new.to_dict("records")) if r}
+        self._record("del", [dict(zip(KEY_COLS, k)) for k in before.keys() - after.keys()])
+        self._record("add", [dict(zip(LOG_COLS, r)) for k, r in after.items() if before.get(k) != r])
+
+    def vector(self) -> dict:
+        """Höchste bekannte seq je Gerät."""
+        with self.store.locked():
+            return dict(self._head_up()["vector"])
+
+    def since(self, vector: dict) -> list:
+        """Alle Änderungen, die ein Gerät mit Stand `vector` noch nicht kennt (je Gerät per bisect)."""
+        with self.store.locked():
+            self._catch_up()
+            out = []
+            for d, lst in self._log.items():
+                out += lst[bisect.bisect_right(lst, vector.get(d, 0), key=attrgetter("seq")):]
+            return out
+
+    def receive(self, changes) -> tuple:
+        """Nimmt fremde Änderungen auf (bekannte (device, seq) werden übersprungen).
+
+        Gibt zurück, was der Store dafür ändern muss: (zu löschende Schlüssel, neue Zeilen als LOG_COLS-Tupel).
+        """
+        with self.store.locked():
+            self._catch_up()
+            vec, new = dict(self._head_up()["vector"]), []
+            for ch in sorted(map(Change._make, changes), key=attrgetter("device", "seq")):
+                if ch.seq > vec.get(ch.device, 0):
+                    new.append(ch)
+                    vec[ch.device] = ch.seq
+            before = {}
+            for ch in new:
+                key = (ch.date, ch.tag, ch.exercise, ch.set)
+                if key not in before: before[key] = self._win.get(key)
+            if new: self._write(new)
+            dels, adds = [], []
+            for key, old in before.items():
+                win = self._win[key]
+                if old is not None and old[3:] == win[3:]: continue  # Stand unverändert
+                if old is not None and old.op == "add": dels.append(key)
+                if win.op == "add": adds.append(tuple(win[4:]))
+            return dels, adds
+
+def _checksum(path: str) -> str:
+    crc = 0
+    with open(path, "rb") as f:
+        while b := f.read(1 << 20):
+            crc = zlib.crc32(b, crc)
+    return f"{os.path.getsize(path)}:{crc:08x}"
+
+class _Store:
+    """Gemeinsame API: versionierter Snapshot von load() + SessionIndex + Rollups (+ ChangeLog), bei Writes nachgeführt.
+
+    `version` steigt bei jedem eigenen Write und bei Änderungen von außen (erkannt über mtime/Größe
+    der Log-Dateien). Der Snapshot wird zwischen Reruns und Sessions geteilt und darf nicht verändert werden.
+    Schreiben (und Parsen) läuft unter `locked()`: Thread-Lock im Prozess + Sperrdatei über Prozesse hinweg.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._flock = _FileLock(path + ".lock")
+        self._lock = threading.RLock()
+        self.version = 0
+        self._stat = None   # Fingerprint der Dateien nach dem letzten bekannten Stand
+        self._snap = None   # (version, DataFrame)
+        self.index = SessionIndex(self)
+        self.rollups = Rollups(self)
+        self.changes = ChangeLog(self)
+
+    def _files(self) -> list:
+        return []
+
+    @contextmanager
+    def locked(self):
+        """Exklusiver Zugriff für Read-Modify-Write-Zyklen (z. B. Import)."""
+        with self._lock:
+            self._flock.acquire()
+            try:
+                yield self
+            finally:
+                self._flock.release()
+
+    def _fingerprint(self) -> tuple:
+        out = []
+        for p in self._files():
+            try:
+                st = os.stat(p)
+                out.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    def refresh(self) -> int:
+        """Verwirft Snapshot + Index, falls die Dateien von außen geändert wurden. Gibt die Version zurück."""
+        with self._lock:
+            fp = self._fingerprint()
+            if fp != self._stat:
+                self._stat = fp
+                self.version += 1
+                self._snap = None
+                self.index.reset()
+                self.rollups.reset()
+            return self.version
+
+    def _written(self):
+        self.version += 1
+        self._snap = None
+        self._stat = self._fingerprint()
+
+    def load(self) -> pd.DataFrame:
+        with self._lock:
+            v = self.refresh()
+            if self._snap is None or self._snap[0] != v:
+                with self.locked():
+                    self._snap = (self.refresh(), self._load())
+            return self._snap[1]
+
+    def save(self, df: pd.DataFrame):
+        with self.locked():
+            old = self.load() if self.changes.enabled else None
+            self._save(df)
+            self._written()
+            self.index.reset()
+            self.rollups.reset()
+            if old is not None: self.changes.on_save(old, df)
+
+    def append(self, row: dict):
+        with self.locked():
+            self.refresh()
+            self._append(row)
+            self._written()
+            self.index.on_append(row)
+            self.rollups.on_append(row)
+            self.changes.on_append(row)
+
+    def extend(self, df: pd.DataFrame):
+        """Hängt viele Zeilen in einem Schreibvorgang an (Import); der Index baut sich danach neu auf."""
+        if df.empty: return
+        with self.locked():
+            self.refresh()
+            self._extend(df[LOG_COLS])
+            self._written()
+            self.index.reset()
+            self.rollups.reset()
+            self.changes.on_extend(df[LOG_COLS])
+
+    def delete(self, date: str, tag: str, exercise: str, set_no: int):
+        with self.locked():
+            self.refresh()
+            self._delete(date, tag, exercise, set_no)
+            self._written()
+            self.index.on_delete(date, tag, exercise, set_no)
+            self.rollups.on_delete(date, tag, exercise, set_no)
+            self.changes.on_delete(date, tag, exercise, set_no)
+
+    def _delete_many(self, keys):
+        for k in keys:
+            self._delete(*k)
+
+    def merge(self, changes) -> int:
+        """Übernimmt Änderungen eines anderen Geräts (Delta-Sync). Gibt die Zahl geänderter Sätze zurück."""
+        self.changes.enable()
+        with self.locked():
+            self.refresh()
+            dels, adds = self.changes.receive(changes)
+            if not dels and not adds:
+                return 0
+            if dels: self._delete_many(dels)
+            if adds: self._extend(pd.DataFrame(adds, columns=LOG_COLS))
+            self._written()
+            for k in dels:
+                self.index.on_delete(*k); self.rollups.on_delete(*k)
+            for row in (dict(zip(LOG_COLS, a)) for a in adds):
+                self.index.on_append(row); self.rollups.on_append(row)
+            return len(set(dels) | {a[:4] for a in adds})
+
+    def keys(self) -> set:
+        """Hash-Index aller (date, tag, exercise, set) im Log."""
+        return _keyset(self.load())
+
+    def load_range(self, start=None, end=None, columns=None, tags=None, exercises=None) -> pd.DataFrame:
+        """Gefilterte Zeilen in einem Frame (Spalten `columns`, Standard LOG_COLS)."""
+        parts = list(self.iter_rows(start, end, tags, exercises))
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=LOG_COLS)
+        return df[list(columns)] if columns is not None else df
+
+    def iter_rows(self, start=None, end=None, tags=None, exercises=None, chunksize: int = EXPORT_CHUNK):
+        """Gefilterte Zeilen (Tage inklusive) in Log-Reihenfolge, blockweise als DataFrames."""
+        df = self.load()
+        m = pd.Series(True, index=df.index)
+        if start is not None: m &= df["date"] >= _iso(start)
+        if end is not None:   m &= df["date"] <= _iso(end)
+        if tags:      m &= df["tag"].isin(list(tags))
+        if exercises: m &= df["exercise"].isin(list(exercises))
+        pos = np.flatnonzero(m.to_numpy())  # Snapshot nicht als Ganzes kopieren, nur je Block
+        for i in range(0, len(pos), chunksize):
+            yield df.iloc[pos[i:i + chunksize]]
+
+# ------------------------- CSV (append-only Journal) -------------------------
+class CsvStore(_Store):
+    """CSV-Log; neue Sätze und Undo-Tombstones landen in einem Journal neben der CSV."""
+
+    def __init__(self, path: str, append_only: bool = True):
+        super().__init__(path)
+        self.journal_path = os.path.splitext(path)[0] + ".journal.csv"
+        self.append_only = append_only
+
+    @property
+    def _marker(self) -> str:
+        return self.journal_path + ".folded"  # Prüfsumme der Basis, in die das Journal gerade gefaltet wird
+
+    @contextmanager
+    def locked(self):
+        with super().locked():
+            self._recover()
+            yield self
+
+    def _folded(self) -> bool:
+        """Liegt laut `_marker` schon die neue Basis, die das Journal enthält?"""
+        try:
+            with open(self._marker, encoding="utf-8") as f:
+                folded = f.read().strip()
+        except FileNotFoundError:
+            return False
+        return os.path.exists(self.path) and _checksum(self.path) == folded
+
+    def _recover(self):
+        """Nach Absturz mitten im Kompaktieren: Journal nur verwerfen, wenn die neue Basis schon liegt."""
+        if not os.path.exists(self._marker):
+            return
+        if self._folded() and os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        os.remove(self._marker)
+
+    def _files(self) -> list:
+        return [self.path, self.journal_path]
+
+    def _replay(self, base: pd.DataFrame, journal: pd.DataFrame) -> pd.DataFrame:
+        """Spielt das Journal ab: 'add' hängt an, 'del' löscht alle älteren Zeilen mit gleichem Schlüssel."""
+        cols = list(base.columns)  # LOG_COLS oder Auswahl inkl. KEY_COLS (ParquetStore.load_range)
+        journal = journal.assign(_seq=range(len(journal)))
+        adds = journal[journal["op"] == "add"]
+        dels = journal[journal["op"] == "del"].groupby(KEY_COLS)["_seq"].max().rename("_del").reset_index()
+        rows = pd.concat([base.assign(_seq=-1), adds[cols + ["_seq"]]], ignore_index=True)
+        if dels.empty:
+            return rows[cols]
+        rows = rows.merge(dels, on=KEY_COLS, how="left")
+        keep = rows["_del"].isna() | (rows["_seq"] > rows["_del"])
+        return rows.loc[keep, cols].reset_index(drop=True)
+
+    def _read_base(self) -> pd.DataFrame:
+        return _read_csv(self.path, LOG_COLS)
+
+    def _write_base(self, df: pd.DataFrame, tmp: str):
+        _count("csv_write")
+        df.to_csv(tmp, index=False)
+
+    def _load(self, compact: bool = True) -> pd.DataFrame:
+        df = self._read_base()
+        if self._folded():  # nur lesend (read_log): Journal steckt schon in der Basis
+            return df
+        journal = _read_csv(self.journal_path, LOG_COLS + ["op"])
+        if journal.empty:
+            return df
+        df = self._replay(df, journal)
+        if compact and len(journal) > COMPACT_AFTER:
+            self._save(df)
+            self._stat = self._fingerprint()  # gleicher Inhalt -> Version bleibt
+        return df
+
+    def _save(self, df: pd.DataFrame):
+        """Schreibt den kompletten Log (atomar) und verwirft das Journal.
+
+        Basis ersetzen und Journal löschen sind zwei Schritte; dazwischen nennt `_marker` die Prüfsumme der
+        neuen Basis, damit `_recover` nach einem Absturz weiß, ob das Journal schon enthalten ist.
+        """
+        journal = os.path.exists(self.journal_path)
+        tmp = _atomic_tmp(self.path)
+        try:
+            self._write_base(df, tmp)
+            if journal:
+                mark = _atomic_tmp(self._marker)
+                with open(mark, "w", encoding="utf-8") as f:
+                    f.write(_checksum(tmp))
+                os.replace(mark, self._marker)
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp): os.remove(tmp)
+        if journal:
+            os.remove(self.journal_path)
+            os.remove(self._marker)
+
+    def compact(self) -> int:
+        """Faltet Journal + Tombstones in eine saubere CSV. Gibt die Anzahl verarbeiteter Journal-Zeilen zurück."""
+        with self.locked():
+            n = len(_read_csv(self.journal_path, LOG_COLS + ["op"]))
+            if n:
+                self._save(self.load())
+                self._stat = self._fingerprint()
+            return n
+
+    def _journal(self, row: dict, op: str):
+        new = not os.path.exists(self.journal_path)
+        _count("csv_write")
+        with open(self.journal_path, "a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            if new: w.writerow(LOG_COLS + ["op"])
+            w.writerow([row.get(c, "") for c in LOG_COLS] + [op])
+
+    def _append(self, row: dict):
+        if self.append_only:
+            self._journal(row, "add")
+            return
+        self._save(pd.concat([self.load(), pd.DataFrame([row], columns=LOG_COLS)], ignore_index=True))
+
+    def _extend(self, df: pd.DataFrame):
+        if not self.append_only:
+            self._save(pd.concat([self.load(), df], ignore_index=True))
+            return
+        new = not os.path.exists(self.journal_path)
+        _count("csv_write")
+        df.assign(op="add").to_csv(self.journal_path, mode="a", header=new, index=False)
+
+    def _delete(self, date: str, tag: str, exercise: str, set_no: int):
+        if self.append_only:
+            self._journal({"date": date, "tag": tag, "exercise": exercise, "set": set_no}, "del")
+            return
+        df = self.load()
+        self._save(df[~((df["date"]==date) & (df["tag"]==tag) & (df["exercise"]==exercise) & (df["set"]==set_no))])
+
+    def recent(self, pairs, sessions: int = 2) -> pd.DataFrame:
+        return _last_sessions(self.load(), pairs, sessions)
+
+    def tail(self, n: int) -> pd.DataFrame:
+        return self.load().tail(n)
+
+# ------------------------- Parquet (Spaltenarchiv) -------------------------
+EPOCH = pd.Timestamp("1970-01-01")
+ARCHIVE_COLS = ["day","tag","exercise","set","weight","reps","rpe","note"]  # day = Tage seit EPOCH
+
+def _iso(d) -> str:
+    return pd.Timestamp(d).strftime("%Y-%m-%d")
+
+def _day(d) -> int:
+    return (pd.Timestamp(d) - EPOCH).days
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Log -> kompakte Dtypes: Tagnummer (Int32), Kategorien für Texte, kleine Ints, float32."""
+    num = lambda c: pd.to_numeric(df[c], errors="coerce")
+    return pd.DataFrame({
+        "day":      ((pd.to_datetime(df["date"]) - EPOCH).dt.days).astype("Int32"),
+        "tag":      df["tag"].astype("category"),
+        "exercise": df["exercise"].astype("category"),
+        "set":      num("set").round().astype("Int8"),
+        "weight":   num("weight").astype("float32"),
+        "reps":     num("reps").round().astype("Int16"),
+        "rpe":      num("rpe").astype("float32"),
+        "note":     df["note"].astype("category"),
+    })
+
+def _uncat(s: pd.Series) -> pd.Series:
+    if not isinstance(s.dtype, pd.CategoricalDtype) or not len(s.cat.categories):
+        return s.astype(object)
+    return s.astype(s.cat.categories.dtype)
+
+def _plain_int(s: pd.Series) -> pd.Series:
+    return s.astype("int64") if not s.isna().any() else s.astype("float64")
+
+def from_columnar(cf: pd.DataFrame) -> pd.DataFrame:
+    """Kompakte Spalten -> Log im üblichen Format (ISO-Datum, Python-Strings); fehlende Spalten bleiben weg."""
+    out = {}
+    if "day" in cf:
+        days = cf["day"].astype("category")
+        iso = (EPOCH + pd.to_timedelta(days.cat.categories.astype("int64"), unit="D")).strftime("%Y-%m-%d")
+        out["date"] = _uncat(days.cat.rename_categories(iso))
+    for c in ["tag","exercise","note"]:
+        if c in cf: out[c] = _uncat(cf[c])
+    for c in ["set","reps"]:
+        if c in cf: out[c] = _plain_int(cf[c])
+    for c in ["weight","rpe"]:
+        if c in cf: out[c] = cf[c].astype("float64").round(3)  # float32-Rauschen weg (22.5 bleibt 22.5)
+    return pd.DataFrame(out, index=cf.index)
+
+def _archive_schema():
+    """Feste Arrow-Typen: auch ein leeres Archiv („Alle Daten löschen“) bleibt mit Filtern auf tag/exercise lesbar."""
+    txt = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    return pyarrow.schema([("day", pyarrow.int32()), ("tag", txt), ("exercise", txt), ("set", pyarrow.int8()),
+                           ("weight", pyarrow.float32()), ("reps", pyarrow.int16()), ("rpe", pyarrow.float32()),
+                           ("note", txt)])
+
+def write_archive(df: pd.DataFrame, path: str):
+    _count("parquet_write")
+    pq.write_table(pyarrow.Table.from_pandas(to_columnar(df), schema=_archive_schema(), preserve_index=False), path)
+
+def read_archive(path: str, columns=None, start=None, end=None, tags=None, exercises=None) -> pd.DataFrame:
+    """Liest nur die gewünschten Spalten, Tage (inklusive), Tags und Übungen aus dem Archiv, in kompakten Dtypes."""
+    filters = [("day", ">=", _day(start))] if start is not None else []
+    if end is not None: filters.append(("day", "<=", _day(end)))
+    if tags:      filters.append(("tag", "in", list(tags)))
+    if exercises: filters.append(("exercise", "in", list(exercises)))
+    _count("parquet_read")
+    return pd.read_parquet(path, columns=columns, filters=filters or None)
+
+class ParquetStore(CsvStore):
+    """Parquet-Archiv mit kompakten Dtypes; neue Sätze landen wie bei CsvStore im CSV-Journal."""
+
+    def __init__(self, path: str, append_only: bool = True):
+        if pyarrow is None:
+            raise ImportError("Parquet-Archiv benötigt pyarrow (pip install pyarrow).")
+        super().__init__(path, append_only=append_only)
+        self.journal_path = path + ".journal.csv"
+        self._tail = None  # (version, n, DataFrame) – Verlauf wird bei jedem Rerun gezeigt
+
+    def _read_base(self) -> pd.DataFrame:
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=LOG_COLS)
+        return from_columnar(read_archive(self.path))[LOG_COLS]
+
+    def _write_base(self, df: pd.DataFrame, tmp: str):
+        write_archive(df, tmp)
+
+    def _journal_rows(self, start=None, end=None, tags=None, exercises=None) -> pd.DataFrame:
+        j = _read_csv(self.journal_path, LOG_COLS + ["op"])
+        if start is not None: j = j[j["date"] >= _iso(start)]
+        if end is not None:   j = j[j["date"] <= _iso(end)]
+        if tags:      j = j[j["tag"].isin(list(tags))]
+        if exercises: j = j[j["exercise"].isin(list(exercises))]
+        return j
+
+    def load_range(self, start=None, end=None, columns=None, tags=None, exercises=None) -> pd.DataFrame:
+        """Wie load(), aber nur Tage [start, end], `tags`, `exercises` und `columns`.
+
+        Liest nur diesen Teil des Archivs und wandelt nur die gelieferten Zeilen ins Log-Format; der Snapshot
+        von load() wird dafür nicht gebaut.
+        """
+        cols = LOG_COLS if columns is None else list(dict.fromkeys(KEY_COLS + list(columns)))  # Schlüssel fürs Journal
+        with self.locked():
+            if os.path.exists(self.path):
+                cf = read_archive(self.path, ["day" if c == "date" else c for c in cols], start, end, tags, exercises)
+                base = from_columnar(cf)[cols]
+            else:
+                base = pd.DataFrame(columns=cols)
+            journal = self._journal_rows(start, end, tags, exercises)
+        df = self._replay(base, journal) if not journal.empty else base
+        return df[list(columns)] if columns is not None else df
+
+    def recent(self, pairs, sessions: int = 2) -> pd.DataFrame:
+        """Wie CsvStore.recent; Auswahl der Tage auf dem kompakten Archiv, gewandelt werden nur die Treffer."""
+        want = pd.DataFrame(list(dict.fromkeys(pairs)), columns=["tag","exercise"])
+        names = sorted(set(want["exercise"]))
+        with self.locked():
+            journal = self._journal_rows(exercises=names)
+            base = pd.DataFrame(columns=LOG_COLS)
+            if names and os.path.exists(self.path):
+                cf = read_archive(self.path, exercises=names)
+                days = cf[["tag","exercise","day"]].drop_duplicates()
+                days = pd.DataFrame({"tag": _uncat(days["tag"]), "exercise": _uncat(days["exercise"]),
+                                     "day": days["day"].astype("int64")}).merge(want)
+                # Jeder Tombstone kann höchstens einen Tag leeren -> so viele Tage zusätzlich
+                extra = (journal[journal["op"] == "del"].drop_duplicates(["tag","exercise","date"])
+                         .groupby(["tag","exercise"]).size().rename("extra").reset_index())
+                days = days.merge(extra, how="left")
+                rank = days.groupby(["tag","exercise"])["day"].rank(method="first", ascending=False)
+                near = days[rank <= sessions + days["extra"].fillna(0)]
+                hit = pd.MultiIndex.from_arrays([cf["tag"], cf["exercise"], cf["day"]]).isin(
+                    pd.MultiIndex.from_frame(near[["tag","exercise","day"]]))
+                base = from_columnar(cf[hit])[LOG_COLS].reset_index(drop=True)
+        rows = self._replay(base, journal) if not journal.empty else base
+        return _last_sessions(rows, pairs, sessions)
+
+    def tail(self, n: int) -> pd.DataFrame:
+        """Letzte `n` Zeilen; gewandelt werden nur die letzten n (+ Tombstones) Zeilen des Archivs."""
+        v = self.refresh()
+        if self._tail is not None and self._tail[:2] == (v, n):
+            return self._tail[2]
+        with self.locked():
+            journal = _read_csv(self.journal_path, LOG_COLS + ["op"])
+            base = pd.DataFrame(columns=LOG_COLS)
+            if os.path.exists(self.path):
+                cf = read_archive(self.path)
+                need = n + int((journal["op"] == "del").sum())
+                base = from_columnar(cf.iloc[max(0, len(cf) - need):])[LOG_COLS].reset_index(drop=True)
+        df = (self._replay(base, journal) if not journal.empty else base).tail(n)
+        self._tail = (v, n, df)
+        return df
+
+    def keys(self) -> set:
+        return _keyset(self.load_range(columns=KEY_COLS))
+
+    def iter_rows(self, start=None, end=None, tags=None, exercises=None, chunksize: int = EXPORT_CHUNK):
+        df = self.load_range(start, end, tags=tags, exercises=exercises)
+        for i in range(0, len(df), chunksize):
+            yield df.iloc[i:i + chunksize]
+
+# ------------------------- SQLite (indiziert) -------------------------
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log (
+    date TEXT, tag TEXT, exercise TEXT, "set" INTEGER,
+    weight REAL, reps INTEGER, rpe REAL, note TEXT
+);
+CREATE INDEX IF NOT EXISTS log_key ON log(tag, exercise, date, "set");
+CREATE INDEX IF NOT EXISTS log_day ON log(date, tag);
+"""
+_SELECT = 'SELECT date, tag, exercise, "set", weight, reps, rpe, note FROM log'
+
+def _records(df: pd.DataFrame):
+    df = df[LOG_COLS].astype(object)
+    return df.where(df.notna(), None).itertuples(index=False, name=None)
+
+class SqliteStore(_Store):
+    """SQLite-Log mit Index auf (tag, exercise, date, set): Abfragen sind Punkt-/Bereichszugriffe."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        with self._con(write=True) as con:
+            con.execute("PRAGMA journal_mode=WAL")  # Leser blockieren Schreiber nicht
+            con.executescript(_SCHEMA)
+
+    def _files(self) -> list:
+        return [self.path, self.path + "-wal"]
+
+    @contextmanager
+    def _con(self, write: bool = False):
+        """Verbindung je Zugriff: Commit bei Erfolg, immer schließen (WAL wird dabei zurückgeschrieben)."""
+        _count("sqlite_write" if write else "sqlite_read")
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def _frame(self, rows) -> pd.DataFrame:
+        return pd.DataFrame(rows, columns=LOG_COLS)
+
+    def _load(self) -> pd.DataFrame:
+        with self._con() as con:
+            return self._frame(con.execute(_SELECT + " ORDER BY rowid").fetchall())
+
+    def _save(self, df: pd.DataFrame):
+        with self._con(write=True) as con:
+            con.execute("DELETE FROM log")
+            con.executemany("INSERT INTO log VALUES (?,?,?,?,?,?,?,?)", _records(df))
+
+    def compact(self) -> int:
+        with self.locked():
+            with self._con(write=True) as con:
+                con.execute("VACUUM")
+            self._stat = self._fingerprint()
+        return 0
+
+    def _append(self, row: dict):
+        with self._con(write=True) as con:
+            con.execute("INSERT INTO log VALUES (?,?,?,?,?,?,?,?)",  # numpy-Skalare sonst als BLOB
+                        [v.item() if hasattr(v, "item") else v for v in (row.get(c) for c in LOG_COLS)])
+
+    def _extend(self, df: pd.DataFrame):
+        with self._con(write=True) as con:
+            con.executemany("INSERT INTO log VALUES (?,?,?,?,?,?,?,?)", _records(df))
+
+    def _delete(self, date: str, tag: str, exercise: str, set_no: int):
+        with self._con(write=True) as con:
+            con.execute('DELETE FROM log WHERE tag=? AND exercise=? AND date=? AND "set"=?',
+                        (tag, exercise, date, int(set_no)))
+
+    def _delete_many(self, keys):
+        with self._con(write=True) as con:
+            con.executemany('DELETE FROM log WHERE date=? AND tag=? AND exercise=? AND "set"=?',
+                            [(d, t, ex, int(s)) for d, t, ex, s in keys])
+
+    def recent(self, pairs, sessions: int = 2) -> pd.DataFrame:
+        rows = []
+        with self._con() as con:
+            for t, ex in dict.fromkeys(pairs):
+                days = con.execute("SELECT DISTINCT date FROM log WHERE tag=? AND exercise=? "
+                                   "ORDER BY date DESC LIMIT ?", (t, ex, sessions)).fetchall()
+                if not days: continue
+                rows += con.execute(_SELECT + ' WHERE tag=? AND exercise=? AND date>=? ORDER BY date, "set"',
+                                    (t, ex, days[-1][0])).fetchall()
+        return self._frame(rows)
+
+    def keys(self) -> set:
+        with self._con() as con:
+            return {(d, t, ex, int(s)) for d, t, ex, s in
+                    con.execute('SELECT date, tag, exercise, "set" FROM log WHERE "set" IS NOT NULL')}
+
+    def iter_rows(self, start=None, end=None, tags=None, exercises=None, chunksize: int = EXPORT_CHUNK):
+        where, args = [], []
+        if start is not None: where.append("date>=?"); args.append(_iso(start))
+        if end is not None:   where.append("date<=?"); args.append(_iso(end))
+        for col, vals in (("tag", tags), ("exercise", exercises)):
+            if vals:
+                vals = list(vals)
+                where.append(f"{col} IN ({','.join('?' * len(vals))})"); args += vals
+        sql = _SELECT + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY rowid"
+        with self._con() as con:
+            cur = con.execute(sql, args)
+            while rows := cur.fetchmany(chunksize):
+                yield self._frame(rows)
+
+    def tail(self, n: int) -> pd.DataFrame:
+        with self._con() as con:
+            rows = con.execute(_SELECT + " WHERE rowid IN (SELECT rowid FROM log ORDER BY rowid DESC LIMIT ?) "
+                               "ORDER BY rowid", (n,)).fetchall()
+        return self._frame(rows)
+
+def migrate_csv(csv_path: str, db_path: str) -> int:
+    """Einmalige Übernahme einer bestehenden CSV (inkl. Journal) in SQLite. Gibt die Zeilenzahl zurück."""
+    df = CsvStore(csv_path).load()
+    tmp = _atomic_tmp(db_path)
+    os.remove(tmp)
+    SqliteStore(tmp).save(df)
+    os.replace(tmp, db_path)
+    os.remove(tmp + ".lock")
+    return len(df)
+
+def _keyset(df: pd.DataFrame) -> set:
+    s = pd.to_numeric(df["set"], errors="coerce")
+    ok = s.notna()
+    return set(zip(df["date"][ok], df["tag"][ok], df["exercise"][ok], s[ok].astype(int)))
+
+def _normalize(chunk: pd.DataFrame):
+    """Rohe Import-Zeilen (alles Text) -> (gültige Zeilen in LOG_COLS, Anzahl verworfener)."""
+    text = lambda c: chunk[c].str.strip() if c in chunk else pd.Series(pd.NA, index=chunk.index, dtype=object)
+    num = lambda c: pd.to_numeric(text(c), errors="coerce")
+    date = pd.to_datetime(text("date"), format="ISO8601", errors="coerce")
+    tag, ex, note = text("tag"), text("exercise"), text("note")
+    set_no, weight, reps, rpe = num("set"), num("weight"), num("reps"), num("rpe")
+    empty = lambda c: text(c).fillna("").eq("")  # fehlt wie im Alt-Log -> NaN, Unlesbares wird verworfen
+    ok = (date.notna() & tag.fillna("").ne("") & ex.fillna("").ne("") & (set_no >= 1) & (set_no % 1 == 0)
+          & (empty("reps") | ((reps >= 0) & (reps % 1 == 0))) & (empty("weight") | (weight >= 0))
+          & (empty("rpe") | rpe.between(0, 10)))
+    df = pd.DataFrame({"date": date.dt.strftime("%Y-%m-%d"), "tag": tag, "exercise": ex, "set": set_no,
+                       "weight": weight, "reps": reps, "rpe": rpe, "note": note})[ok]
+    return df.assign(set=df["set"].astype("int64"), reps=_plain_int(df["reps"])), int((~ok).sum())
+
+ImportReport = namedtuple("ImportReport", "added duplicate rejected")
+
+def import_csv(store, src, chunksize: int = IMPORT_CHUNK) -> ImportReport:
+    """Übernimmt eine CSV (Pfad oder Datei-Objekt) blockweise in den Store.
+
+    Zeilen werden geprüft und normalisiert (ISO-Datum, ganzzahlige Sätze/Wdh.); Schlüssel
+    (date, tag, exercise, set), die es im Log oder weiter oben in der Datei schon gibt, zählen als Duplikat.
+    """
+    added = duplicate = rejected = 0
+    with store.locked():
+        seen = store.keys()
+        for i, chunk in enumerate(pd.read_csv(src, dtype=str, chunksize=chunksize)):
+            if i == 0 and (missing := [c for c in KEY_COLS if c not in chunk.columns]):
+                raise ValueError(f"Spalten fehlen: {', '.join(missing)}")
+            df, bad = _normalize(chunk)
+            new = []
+            for k in zip(df["date"], df["tag"], df["exercise"], df["set"]):
+                new.append(k not in seen)
+                seen.add(k)
+            df = df[new]
+            store.extend(df)
+            added += len(df); duplicate += len(new) - len(df); rejected += bad
+    return ImportReport(added, duplicate, rejected)
+
+def export_csv(store, start=None, end=None, tags=None, exercises=None, gzip: bool = False,
+               chunksize: int = EXPORT_CHUNK):
+    """CSV-Export als Generator von Byte-Blöcken (optional gzip), damit nie der ganze Log serialisiert im Speicher liegt."""
+    z = zlib.compressobj(wbits=31) if gzip else None  # wbits=31 -> gzip-Container
+    header = True
+    for df in store.iter_rows(start, end, tags, exercises, chunksize):
+        b = df.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+        yield z.compress(b) if z else b
+    if header:  # nichts gefiltert -> trotzdem Kopfzeile
+        b = (",".join(LOG_COLS) + "\n").encode("utf-8")
+        yield z.compress(b) if z else b
+    if z:
+        yield z.flush()
+
+def export_csv_file(store, start=None, end=None, tags=None, exercises=None, gzip: bool = False):
+    """export_csv blockweise in eine Temp-Datei (auf Platte statt als Byte-Liste im Speicher), Position 0.
+
+    Ungepuffert, damit st.download_button sie als io.RawIOBase annimmt; die Datei verschwindet beim Schließen.
+    """
+    f = tempfile.TemporaryFile(buffering=0)
+    for b in export_csv(store, start, end, tags, exercises, gzip=gzip):
+        f.write(b)
+    f.seek(0)
+    return f if isinstance(f, io.RawIOBase) else io.BytesIO(f.read())  # Windows: Wrapper um NamedTemporaryFile
+
+def athlete_slug(name: str) -> str:
+    """Dateisystem-tauglicher Name einer Athleten-Partition."""
+    return re.sub(r"[^\w-]+", "_", name.strip()).strip("_")
+
+def partition_path(path: str, athlete: str = None, root: str = ATHLETES_DIR) -> str:
+    """Log-Datei eines Athleten (`root/<athlet>/<dateiname>`); ohne Athlet der gemeinsame Log `path`."""
+    if not athlete or not athlete_slug(athlete):
+        return path
+    return os.path.join(root, athlete_slug(athlete), os.path.basename(path))
+
+def list_athletes(root: str = ATHLETES_DIR) -> list:
+    if not os.path.isdir(root):
+        return []
+    return sorted(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)))
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+def store_class(path: str) -> type:
+    """Backend nach Endung: .sqlite/.db -> SqliteStore, .parquet -> ParquetStore, sonst CsvStore."""
+    if path.endswith((".sqlite", ".db")):
+        return SqliteStore
+    return ParquetStore if path.endswith(".parquet") else CsvStore
+
+def read_log(path: str) -> pd.DataFrame:
+    """Liest einen vorhandenen Log nur lesend: ohne Sperrdatei, Schema-Anlage oder Kompaktieren (z. B. backtest.py)."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    cls = store_class(path)
+    if cls is not SqliteStore:
+        return cls(path)._load(compact=False)
+    con = sqlite3.connect(f"file:{urllib.request.pathname2url(os.path.abspath(path))}?mode=ro", uri=True)
+    try:
+        return pd.DataFrame(con.execute(_SELECT + " ORDER BY rowid").fetchall(), columns=LOG_COLS)
+    finally:
+        con.close()
+
+def open_store(path: str, csv_path: str = None, append_only: bool = True):
+    """Öffnet das Backend passend zur Endung; neue SQLite-/Parquet-Logs übernehmen einmalig `csv_path`.
+
+    Stores (und damit ihr SessionIndex) werden je Pfad im Prozess wiederverwendet, überleben also Reruns.
+    """
+    with _STORES_LOCK:
+        if path not in _STORES:
+            if csv_path and not os.path.exists(csv_path):
+                csv_path = None  # nichts zu übernehmen (sonst bleibt eine leere CSV-Sperrdatei liegen)
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            cls = store_class(path)
+            if cls is SqliteStore:
+                if not os.path.exists(path) and csv_path:
+                    migrate_csv(csv_path, path)
+                _STORES[path] = SqliteStore(path)
+            elif cls is ParquetStore:
+                store = ParquetStore(path, append_only=append_only)
+                if not os.path.exists(path) and csv_path:
+                    store.save(CsvStore(csv_path).load())
+                _STORES[path] = store
+            else:
+                _STORES[path] = CsvStore(path, append_only=append_only)
+        return _STORES[path]
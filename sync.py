@@ -0,0 +1,185 @@
+"""Delta-Sync zwischen Geräten über das Änderungsprotokoll der Stores (storage.ChangeLog).
+
+Ausgetauscht werden nur Änderungen (neue Sätze, Undos), die die Gegenseite laut ihrem Stand je Gerät
+noch nicht kennt; Konflikte je (date, tag, exercise, set) löst die Lamport-Uhr auf beiden Seiten gleich.
+HTTP-Peers verlangen ein gemeinsames Token (`--token` oder $FITNESS_SYNC_TOKEN; `serve` erzeugt sonst eins).
+
+    python sync.py serve workout_log.sqlite --port 8765                         # Stand-in-Peer über HTTP
+    python sync.py run workout_log.sqlite http://127.0.0.1:8765 --token <token> # gegen HTTP-Peer
+    python sync.py run workout_log.sqlite /mnt/usb/workout_log.sqlite           # gegen anderen Log (Datei-Peer)
+"""
+import argparse
+import hmac
+import json
+import os
+import secrets
+import sys
+import urllib.request
+from collections import namedtuple
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from storage import ATHLETES_DIR, CHANGE_COLS, open_store
+
+TOKEN_ENV = "FITNESS_SYNC_TOKEN"
+
+SyncReport = namedtuple("SyncReport", "sent received changed")
+
+def encode(changes) -> dict:
+    return {"cols": CHANGE_COLS, "rows": [list(c) for c in changes]}
+
+def decode(body: dict) -> list:
+    if body.get("cols") != CHANGE_COLS:
+        raise ValueError(f"Unbekanntes Änderungsformat: {body.get('cols')}")
+    return body["rows"]
+
+class StorePeer:
+    """Anderer Log im Dateisystem (Netzlaufwerk, USB, zweite Partition) als Gegenstelle."""
+
+    def __init__(self, store):
+        self.store = store
+        store.changes.enable()
+
+    def vector(self) -> dict:
+        return self.store.changes.vector()
+
+    def pull(self, since: dict) -> list:
+        return self.store.changes.since(since)
+
+    def push(self, changes) -> int:
+        return self.store.merge(changes)
+
+class HttpPeer:
+    """Gegenstelle per HTTP/JSON (siehe `serve`)."""
+
+    def __init__(self, url: str, token: str, timeout: float = 30):
+        self.url, self.token, self.timeout = url.rstrip("/"), token, timeout
+
+    def _call(self, path: str, body: dict = None) -> dict:
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        req = urllib.request.Request(self.url + path, data=data, headers={
+            "Content-Type": "application/json", "Authorization": f"Bearer {self.token}"})
+        with urllib.request.urlopen(req, timeout=self.timeout) as r:
+            return json.load(r)
+
+    def vector(self) -> dict:
+        return self._call("/vector")["vector"]
+
+    def pull(self, since: dict) -> list:
+        return decode(self._call("/pull", {"since": since}))
+
+    def push(self, changes) -> int:
+        return self._call("/push", encode(changes))["changed"]
+
+def _inside(path: str, root: str) -> bool:
+    path, root = os.path.realpath(path), os.path.realpath(root)
+    return os.path.commonpath([path, root]) == root
+
+def open_peer(target: str, token: str = None):
+    """URL -> HttpPeer, sonst Pfad eines vorhandenen Logs -> StorePeer.
+
+    Datei-Peers müssen existieren (es wird nichts angelegt) und dürfen nicht in ATHLETES_DIR liegen,
+    damit ein Abgleich nicht in die Partition eines anderen Athleten schreibt.
+    """
+    if target.startswith(("http://", "https://")):
+        if not token:
+            raise ValueError("HTTP-Peer braucht ein Token.")
+        return HttpPeer(target, token)
+    if not os.path.isfile(target):
+        raise FileNotFoundError(f"Kein Log unter {target}.")
+    if _inside(target, ATHLETES_DIR):
+        raise ValueError(f"{target} liegt in {ATHLETES_DIR}/ (Partition eines Athleten).")
+    return StorePeer(open_store(target))
+
+def sync(store, peer, label: str = None) -> SyncReport:
+    """Zwei-Wege-Abgleich: erst eigene Änderungen hin, dann fremde zurück – jeweils nur das Delta."""
+    store.changes.enable()
+    out = store.changes.since(peer.vector())
+    if out: peer.push(out)
+    inc = peer.pull(store.changes.vector())
+    rep = SyncReport(len(out), len(inc), store.merge(inc) if inc else 0)
+    if label:
+        store.changes.note_peer(label, at=datetime.now().isoformat(timespec="seconds"), **rep._asdict())
+    return rep
+
+def serve(store, token: str, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP-Gegenstelle für einen Store: GET /vector, POST /pull {since}, POST /push {cols, rows}.
+
+    Jede Anfrage braucht `Authorization: Bearer <token>`, sonst 401.
+    """
+    if not token:
+        raise ValueError("serve braucht ein Token.")
+    store.changes.enable()
+    expected = f"Bearer {token}".encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, obj: dict, status: int = 200):
+            b = json.dumps(obj).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(b)))
+            self.end_headers()
+            self.wfile.write(b)
+
+        def _authorized(self) -> bool:
+            if hmac.compare_digest(self.headers.get("Authorization", "").encode("utf-8"), expected):
+                return True
+            self._send({"error": "unauthorized"}, 401)
+            return False
+
+        def do_GET(self):
+            if not self._authorized(): return
+            if self.path == "/vector":
+                self._send({"device": store.changes.device, "vector": store.changes.vector()})
+            else:
+                self._send({"error": "not found"}, 404)
+
+        def do_POST(self):
+            if not self._authorized(): return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path == "/pull":
+                    self._send(encode(store.changes.since(body.get("since", {}))))
+                elif self.path == "/push":
+                    self._send({"changed": store.merge(decode(body))})
+                else:
+                    self._send({"error": "not found"}, 404)
+            except (ValueError, KeyError, TypeError) as e:
+                self._send({"error": str(e)}, 400)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="Log per HTTP als Peer bereitstellen")
+    s.add_argument("log")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8765)
+    r = sub.add_parser("run", help="Log mit einem Peer abgleichen")
+    r.add_argument("log")
+    r.add_argument("peer", help="URL (http://…) oder Pfad eines anderen Logs")
+    for p in (s, r):
+        p.add_argument("--token", default=os.environ.get(TOKEN_ENV), help=f"gemeinsames Token (Standard: ${TOKEN_ENV})")
+    args = ap.parse_args(argv)
+    store = open_store(args.log)
+    if args.cmd == "serve":
+        token = args.token or secrets.token_urlsafe(16)
+        srv = serve(store, token, args.host, args.port)
+        print(f"Sync-Peer für {args.log} auf http://{args.host}:{srv.server_port} (Gerät {store.changes.device})")
+        if not args.token:
+            print(f"Token: {token}")
+        try:
+            srv.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+    rep = sync(store, open_peer(args.peer, args.token), label=args.peer)
+    print(f"{rep.sent} gesendet · {rep.received} empfangen · {rep.changed} Sätze geändert")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
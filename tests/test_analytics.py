@@ -0,0 +1,49 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import pr_history, weekly_rollup
+from bench import synthetic_log
+from storage import LOG_COLS, CsvStore, SqliteStore
+
+def same(a: pd.DataFrame, b: pd.DataFrame, by):
+    a, b = (x.sort_values(by, kind="stable", ignore_index=True) for x in (a, b))
+    pd.testing.assert_frame_equal(a.astype({c: float for c in a.columns if c not in by}),
+                                  b.astype({c: float for c in b.columns if c not in by}),
+                                  check_dtype=False, check_exact=False, atol=1e-6)
+
+def check(store):
+    df = store.load()
+    same(store.rollups.weeks(), weekly_rollup(df), ["tag","exercise","week"])
+    key = lambda f: sorted(zip(f["exercise"], f["date"], f["tag"], f["e1rm"].astype(float).round(6)))
+    assert key(store.rollups.prs()) == key(pr_history(df))
+
+@pytest.mark.parametrize("cls,name", [(SqliteStore, "log.sqlite"), (CsvStore, "log.csv")])
+@pytest.mark.parametrize("seed", range(2))
+def test_incremental_rollups_match_rebuild(tmp_path, cls, name, seed):
+    rng = random.Random(seed)
+    store = cls(str(tmp_path / name))
+    store.save(synthetic_log(60, 1, seed))
+    check(store)
+    exercises = sorted(store.load()["exercise"].unique())[:3]
+    for _ in range(25):
+        df = store.load()
+        if rng.random() < 0.35 and len(df):
+            r = df.iloc[rng.randrange(len(df))]
+            store.delete(r["date"], r["tag"], r["exercise"], int(r["set"]))  # Undo, auch ältere Wochen
+        else:
+            day = sorted(df["date"].unique())[-rng.randrange(1, 15)]  # auch Nachträge vor dem letzten PR
+            store.append({"date": day, "tag": "A", "exercise": rng.choice(exercises), "set": rng.randint(6, 9),
+                          "weight": rng.choice([20.0, 40.0, 80.0, 120.0]), "reps": rng.randint(1, 12),
+                          "rpe": rng.choice([7.0, 8.5, 10.0, np.nan]), "note": ""})
+        check(store)
+
+def test_rollups_follow_external_writes(tmp_path):
+    a = SqliteStore(str(tmp_path / "log.sqlite"))
+    a.save(synthetic_log(30, 1, 0))
+    a.rollups.weeks()
+    b = SqliteStore(a.path)  # zweiter Prozess
+    b.save(pd.DataFrame(columns=LOG_COLS))
+    assert a.rollups.weeks().empty and a.rollups.prs().empty
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+import coach
+from backtest import deload_replay, replay
+from bench import synthetic_log
+from coach import PLAN
+
+EX, LR, HR, INC, _ = PLAN["A"][0]
+
+def log(*sessions):
+    return pd.DataFrame([{"date": d, "tag": "A", "exercise": EX, "set": s, "weight": w, "reps": r, "rpe": e, "note": ""}
+                         for d, w, reps, e in sessions for s, r in enumerate(reps, start=1)])
+
+def test_replay_weight_step_followed():
+    df = log(("2026-01-05", 40.0, [HR] * 3, 8.0), ("2026-01-08", 40.0 + INC, [LR] * 3, 8.0))
+    r = replay(df).iloc[0]
+    assert (r["date"], r["case"], r["suggested"], r["actual"]) == ("2026-01-08", "weight", 40.0 + INC, "add_weight")
+    assert r["followed"] and r["in_range"] and r["error"] == 0
+
+def test_replay_hold_not_followed():
+    df = log(("2026-01-05", 40.0, [LR - 1] * 3, 9.5), ("2026-01-08", 45.0, [LR] * 3, 9.0))
+    r = replay(df).iloc[0]
+    assert (r["case"], r["suggested"], r["actual"], bool(r["followed"]), r["error"]) == ("hold_rpe_low", 40.0, "add_weight", False, 5.0)
+
+def test_replay_matches_coach_on_previous_session():
+    df = synthetic_log(120, 1, 3)
+    rep = replay(df)
+    assert len(rep) == df.groupby(["tag","exercise"])["date"].nunique().sub(1).sum()
+    for r in rep.sample(25, random_state=0).itertuples(index=False):
+        s = coach.suggest_target(df[df["date"] < r.date], r.tag, r.exercise)
+        assert s["mode"] == r.mode
+        assert s.get("base", float("nan")) + s.get("inc", 0.0) == pytest.approx(r.suggested, nan_ok=True)
+
+def test_deload_replay_matches_needs_deload():
+    df = synthetic_log(120, 1, 5)
+    dl = deload_replay(df).set_index("date")
+    for d in sorted(df["date"].unique())[::7]:
+        _, info = coach.needs_deload(coach.session_table(df[df["date"] <= d]), pd.Timestamp(d).date())
+        assert (dl.loc[d, "slips"], bool(dl.loc[d, "fatigue"])) == (info["slips"], info["fatigue"])
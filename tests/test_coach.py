@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+import pytest
+
+import coach
+from bench import synthetic_log
+from storage import SessionIndex
+
+def batch(df, tag, chosen=None, **kw):
+    out = coach.suggest_batch(df, coach.day_slots(tag, chosen), **kw)
+    return {int(r.slot): coach._as_suggestion(r) for r in out.itertuples(index=False)}
+
+@pytest.mark.parametrize("seed", range(5))
+def test_single_slot_matches_batch(seed):
+    df = synthetic_log(90, 1, seed)
+    rng = random.Random(seed)
+    df.loc[rng.sample(range(len(df)), 10), "rpe"] = np.nan
+    df.loc[rng.sample(range(len(df)), 5), "reps"] = np.nan
+    idx = SessionIndex.from_frame(df)
+    for tag in coach.PLAN:
+        chosen = {i: rng.choice(coach.EXERCISE_POOL) for i in range(1, len(coach.PLAN[tag]) + 1)}
+        want = batch(df, tag, chosen)
+        assert coach.suggest_day(df, tag, chosen) == want
+        assert coach.suggest_day_index(idx, tag, chosen) == want
+        for n, *m in coach.PLAN[tag]:
+            s = coach.suggest_target(df, tag, n, m)
+            assert coach.suggest_unit(idx.last(tag, n), tag, n, m) == s
+        loose = batch(df, tag, rpe_add=8.5, rpe_hold=9.5)
+        for t, i, ex, lr, hr, inc, tp in coach._day_rows(tag):
+            assert coach.evaluate(coach._last_sets(df, t, ex), lr, hr, inc, tp, 8.5, 9.5) == loose[i]
+
+def test_first_session_starts():
+    s = coach.suggest_unit(None, "A", coach.PLAN["A"][0][0])
+    assert s["mode"] == "start"
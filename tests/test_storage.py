@@ -0,0 +1,197 @@
+import os
+
+import pandas as pd
+import pytest
+
+import storage
+from storage import COMPACT_AFTER, LOG_COLS, CsvStore, ParquetStore
+
+def row(s, weight=20.0, date="2026-01-05", ex="Bankdrücken"):
+    return {"date": date, "tag": "A", "exercise": ex, "set": s, "weight": weight, "reps": 8, "rpe": 8.0, "note": ""}
+
+@pytest.fixture(params=[CsvStore, ParquetStore])
+def store(request, tmp_path):
+    name = "log.csv" if request.param is CsvStore else "log.parquet"
+    st = request.param(str(tmp_path / name))
+    st.save(pd.DataFrame(columns=LOG_COLS))
+    return st
+
+def reopen(st):
+    return type(st)(st.path)
+
+def test_tombstone_then_readd_same_key(store):
+    store.append(row(1, 20.0))
+    store.append(row(2, 20.0))
+    store.delete("2026-01-05", "A", "Bankdrücken", 1)
+    store.append(row(1, 22.5))
+    for st in (store, reopen(store)):
+        df = st.load()
+        assert sorted(df["set"].astype(int)) == [1, 2]
+        assert df.loc[df["set"].astype(int) == 1, "weight"].astype(float).tolist() == [22.5]
+
+def test_tombstone_removes_base_rows(store):
+    store.save(pd.DataFrame([row(1), row(2)]))
+    store.delete("2026-01-05", "A", "Bankdrücken", 2)
+    assert reopen(store).load()["set"].astype(int).tolist() == [1]
+    assert os.path.exists(store.journal_path)
+
+def test_auto_compaction(store):
+    for i in range(COMPACT_AFTER + 1):
+        store.append(row(1 + i % 5, date=f"2026-01-{1 + i // 5 % 28:02d}", ex=f"Ü{i // 140}"))
+    st = reopen(store)
+    df = st.load()
+    assert not os.path.exists(st.journal_path)
+    assert len(df) == COMPACT_AFTER + 1
+    assert len(reopen(store).load()) == COMPACT_AFTER + 1
+
+def test_compact_returns_journal_rows(store):
+    store.append(row(1))
+    store.delete("2026-01-05", "A", "Bankdrücken", 1)
+    store.append(row(1, 25.0))
+    assert store.compact() == 3
+    assert store.compact() == 0
+    assert reopen(store).load()["weight"].astype(float).tolist() == [25.0]
+
+def test_crash_after_base_replace_does_not_duplicate(store, monkeypatch):
+    for s in (1, 2, 3):
+        store.append(row(s))
+    real = os.remove
+    def crash(path):
+        if path == store.journal_path: raise KeyboardInterrupt
+        real(path)
+    monkeypatch.setattr(storage.os, "remove", crash)
+    with pytest.raises(KeyboardInterrupt):
+        store.compact()
+    monkeypatch.setattr(storage.os, "remove", real)
+    assert os.path.exists(store.journal_path)
+    st = reopen(store)
+    assert st.load()["set"].astype(int).tolist() == [1, 2, 3]
+    assert not os.path.exists(store.journal_path) and not os.path.exists(st._marker)
+
+def test_crash_before_base_replace_keeps_journal(store):
+    store.append(row(1))
+    with open(store._marker, "w") as f:  # Marker geschrieben, Basis noch alt
+        f.write("0:00000000")
+    st = reopen(store)
+    assert st.load()["set"].astype(int).tolist() == [1]
+    assert not os.path.exists(st._marker)
+
+def test_legacy_csv_without_rpe_and_note(tmp_path):
+    path = tmp_path / "workout_log.csv"
+    path.write_text("date,tag,exercise,set,weight,reps\n2025-03-01,A,Kniebeuge,1,60,8\n2025-03-01,A,Kniebeuge,2,60,7\n")
+    st = CsvStore(str(path))
+    df = st.load()
+    assert list(df.columns) == LOG_COLS
+    assert df["reps"].tolist() == [8, 7] and df["rpe"].isna().all()
+    st.append(row(1, date="2025-03-03", ex="Kniebeuge"))
+    assert len(CsvStore(str(path)).load()) == 3
+
+def test_parquet_partial_reads_match_csv(tmp_path, monkeypatch):
+    rows = [row(s, 20.0 + d, date=f"2026-02-{d:02d}", ex=ex) for d in range(1, 9) for ex in ("X", "Y") for s in (1, 2)]
+    pq, cs = ParquetStore(str(tmp_path / "log.parquet")), CsvStore(str(tmp_path / "log.csv"))
+    for st in (pq, cs):
+        st.save(pd.DataFrame(rows))
+        for s in (1, 2):  # letzte Einheit von X komplett zurückgenommen
+            st.delete("2026-02-08", "A", "X", s)
+        st.append(row(3, 99.0, date="2026-02-09", ex="Y"))
+    seen = []
+    real = storage.read_archive
+    monkeypatch.setattr(storage, "read_archive", lambda path, columns=None, *a, **k: seen.append(columns) or real(path, columns, *a, **k))
+    pq = ParquetStore(pq.path)
+    norm = lambda d: (d.drop(columns="note").astype({"set": int, "weight": float})  # "" vs. NaN je nach Format
+                       .sort_values(["date", "exercise", "set"], ignore_index=True))
+    assert norm(pq.recent([("A", "X"), ("A", "Y")])).equals(norm(cs.recent([("A", "X"), ("A", "Y")])))
+    assert norm(pq.tail(5)).equals(norm(cs.tail(5)))
+    assert pq.keys() == cs.keys()
+    got = pq.load_range("2026-02-03", "2026-02-05", columns=["date", "weight"], exercises=["X"])
+    assert list(got.columns) == ["date", "weight"] and len(got) == 6
+    assert seen[-1] == ["day", "tag", "exercise", "set", "weight"]
+    assert pq._snap is None  # kein voll gewandelter Snapshot
+
+def test_export_file_matches_chunks(store):
+    store.save(pd.DataFrame([row(s, date=f"2026-03-{d:02d}") for d in range(1, 11) for s in (1, 2, 3)]))
+    store.delete("2026-03-02", "A", "Bankdrücken", 2)
+    parts = list(store.iter_rows(start="2026-03-02", end="2026-03-05", chunksize=4))
+    assert [len(p) for p in parts] == [4, 4, 3]
+    f = storage.export_csv_file(store, start="2026-03-02", end="2026-03-05")
+    assert f.read() == b"".join(storage.export_csv(store, start="2026-03-02", end="2026-03-05"))
+    f.close()
+
+@pytest.mark.parametrize("name", ["log.db", "log.sqlite", "log.parquet", "log.csv"])
+def test_read_log_dispatches_like_open_store_without_locks(tmp_path, name):
+    path = str(tmp_path / name)
+    st = storage.store_class(path)(path)
+    st.save(pd.DataFrame([row(1), row(2)], columns=LOG_COLS))
+    st.append(row(3))
+    for f in tmp_path.glob("*.lock"):
+        f.unlink()
+    assert sorted(storage.read_log(path)["set"].astype(int)) == [1, 2, 3]
+    assert not list(tmp_path.glob("*.lock"))
+
+def test_parquet_delete_all_keeps_archive_readable(tmp_path):
+    st = ParquetStore(str(tmp_path / "log.parquet"))
+    st.append(row(1))
+    st.compact()
+    st.save(pd.DataFrame(columns=LOG_COLS))  # „Alle Daten löschen“
+    st.index.ensure([("A", "Bankdrücken")])
+    assert st.index.last("A", "Bankdrücken") is None
+    assert st.load_range(tags=["A"], exercises=["Bankdrücken"]).empty
+    st.append(row(1))
+    assert len(reopen(st).recent([("A", "Bankdrücken")], 2)) == 1
+
+def test_import_csv_counts_across_chunks(store, tmp_path):
+    store.append(row(1))
+    src = tmp_path / "in.csv"
+    src.write_text("date,tag,exercise,set,weight,reps,rpe,note\n"
+                   "2026-01-05,A,Bankdrücken,1,20,8,8,\n"    # schon im Log
+                   "2026-01-05,A,Bankdrücken,2,20,8,8,\n"
+                   "2026-01-05,A,Bankdrücken,2,22.5,8,8,\n"  # Duplikat in der Datei (nächster Block)
+                   "2026-01-05,A,Bankdrücken,0,20,8,8,\n"    # Satz 0
+                   "kein-datum,A,Bankdrücken,3,20,8,8,\n"
+                   "2026-01-06,A,Bankdrücken,1,20,abc,8,\n"
+                   "2026-01-06,A,Bankdrücken,2,20,8,,\n", encoding="utf-8")
+    rep = storage.import_csv(store, str(src), chunksize=2)
+    assert rep == storage.ImportReport(added=2, duplicate=2, rejected=3)
+    df = reopen(store).load()
+    assert len(df) == 3
+    assert df.loc[df["set"].astype(int) == 2, "weight"].astype(float).tolist() == [20.0, 20.0]
+
+def test_import_csv_without_weight_column(store, tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text("date,tag,exercise,set,reps\n2026-01-05,A,Bankdrücken,1,8\n2026-01-05,A,Bankdrücken,2,\n",
+                   encoding="utf-8")
+    assert storage.import_csv(store, str(src)) == storage.ImportReport(added=2, duplicate=0, rejected=0)
+    assert store.load()["weight"].isna().all()
+
+def test_import_csv_requires_key_columns(store, tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text("date,tag,set\n2026-01-05,A,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="exercise"):
+        storage.import_csv(store, str(src))
+
+def test_index_skips_rows_without_set(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("date,tag,exercise,set,weight,reps,rpe,note\n"
+                    "2026-01-05,A,Bankdrücken,,20,8,8,\n"
+                    "2026-01-05,A,Bankdrücken,1,20,8,8,\n", encoding="utf-8")
+    st = CsvStore(str(path))
+    u = st.index.last("A", "Bankdrücken")
+    assert [s for s, *_ in u.sets] == [1]
+
+def test_snapshot_shared_until_write(store):
+    store.append(row(1))
+    v, snap = store.version, store.load()
+    assert store.load() is snap and store.refresh() == v
+    store.append(row(2))
+    assert store.version > v and store.load() is not snap
+    assert len(store.load()) == 2
+
+def test_snapshot_invalidated_by_external_write(store):
+    store.append(row(1))
+    store.index.ensure([("A", "Bankdrücken")])
+    v, snap = store.version, store.load()
+    other = reopen(store)  # zweiter Prozess auf demselben Log
+    other.append(row(2, 25.0))
+    assert store.refresh() > v
+    assert store.load() is not snap and len(store.load()) == 2
+    assert [s for s, *_ in store.index.last("A", "Bankdrücken").sets] == [1, 2]
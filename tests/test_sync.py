@@ -0,0 +1,108 @@
+import threading
+import urllib.error
+
+import pandas as pd
+import pytest
+
+import sync
+from storage import LOG_COLS, CsvStore, SqliteStore, _norm
+from sync import HttpPeer, StorePeer
+
+def row(s, weight=20.0, date="2026-01-05", ex="Bankdrücken"):
+    return {"date": date, "tag": "A", "exercise": ex, "set": s, "weight": weight, "reps": 8, "rpe": 8.0, "note": ""}
+
+def state(st):
+    return sorted(filter(None, map(_norm, st.load().to_dict("records"))))
+
+@pytest.fixture
+def pair(tmp_path):
+    a, b = SqliteStore(str(tmp_path / "a.sqlite")), CsvStore(str(tmp_path / "b.csv"))
+    for st in (a, b):
+        st.save(pd.DataFrame(columns=LOG_COLS))
+        st.changes.enable()
+    return a, b
+
+def test_two_way_convergence(pair):
+    a, b = pair
+    a.append(row(1)); a.append(row(2))
+    b.append(row(1, ex="Rudern"))
+    rep = sync.sync(a, StorePeer(b))
+    assert (rep.sent, rep.received) == (2, 1)
+    assert state(a) == state(b)
+    assert len(state(a)) == 3
+
+def test_concurrent_edit_same_key_resolves_identically(pair):
+    a, b = pair
+    a.append(row(1)); sync.sync(a, StorePeer(b))
+    a.delete("2026-01-05", "A", "Bankdrücken", 1); a.append(row(1, 25.0))
+    b.delete("2026-01-05", "A", "Bankdrücken", 1); b.append(row(1, 27.5))
+    edits = [c for st in (a, b) for c in st.changes.since({}) if c.op == "add" and c.weight != 20.0]
+    sync.sync(a, StorePeer(b))
+    assert state(a) == state(b)
+    assert len(state(a)) == 1
+    assert state(a)[0][4] == max(edits, key=lambda c: (c.clock, c.device)).weight
+
+def test_undo_propagates(pair):
+    a, b = pair
+    a.append(row(1)); a.append(row(2))
+    sync.sync(a, StorePeer(b))
+    a.delete("2026-01-05", "A", "Bankdrücken", 2)
+    rep = sync.sync(a, StorePeer(b))
+    assert (rep.sent, rep.received) == (1, 0)
+    assert [r[3] for r in state(b)] == [1]
+
+def test_resync_is_noop(pair):
+    a, b = pair
+    a.append(row(1)); b.append(row(2))
+    sync.sync(a, StorePeer(b))
+    assert sync.sync(a, StorePeer(b)) == (0, 0, 0)
+    assert sync.sync(b, StorePeer(a)) == (0, 0, 0)
+
+def test_on_save_records_only_the_diff(pair):
+    a, _ = pair
+    for s in (1, 2, 3):
+        a.append(row(s))
+    vec = a.changes.vector()
+    df = a.load()
+    df = df[df["set"].astype(int) != 3].copy()
+    df.loc[df["set"].astype(int) == 2, "weight"] = 22.5
+    a.save(df)
+    assert [(c.op, c.set, c.weight) for c in a.changes.since(vec)] == [("del", 3, None), ("add", 2, 22.5)]
+
+def test_restart_appends_without_reading_the_log(pair):
+    a, _ = pair
+    a.append(row(1)); a.append(row(2))
+    dev, seq = a.changes.device, a.changes.vector()[a.changes.device]
+    a2 = SqliteStore(a.path)
+    a2.append(row(3))
+    assert a2.changes._log == {}
+    assert a2.changes.vector()[dev] == seq + 1
+    assert [c.set for c in a2.changes.since({dev: seq})] == [3]
+
+def test_http_peer_requires_token(pair):
+    a, b = pair
+    srv = sync.serve(b, "s3cret", port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{srv.server_port}"
+    try:
+        with pytest.raises(urllib.error.HTTPError) as e:
+            HttpPeer(url, "wrong").vector()
+        assert e.value.code == 401
+        a.append(row(1))
+        assert sync.sync(a, HttpPeer(url, "s3cret")).sent == 1
+        assert state(a) == state(b)
+    finally:
+        srv.shutdown(); srv.server_close()
+
+def test_open_peer_rejects_missing_and_partition_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(sync, "ATHLETES_DIR", str(tmp_path / "athletes"))
+    with pytest.raises(FileNotFoundError):
+        sync.open_peer(str(tmp_path / "nope.sqlite"))
+    assert not (tmp_path / "nope.sqlite").exists()
+    part = tmp_path / "athletes" / "anna"
+    part.mkdir(parents=True)
+    SqliteStore(str(part / "workout_log.sqlite"))
+    with pytest.raises(ValueError):
+        sync.open_peer(str(part / "workout_log.sqlite"))
+    with pytest.raises(ValueError):
+        sync.open_peer("http://127.0.0.1:1")